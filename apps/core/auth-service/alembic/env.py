@@ -16,6 +16,7 @@ from alembic import context
 # Import all models to ensure they're registered with SQLModel
 from app.models import AuthorizationCode, User
 from app.config.settings import Settings
+from app.partitions import is_partition
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -28,7 +29,7 @@ if config.config_file_name is not None:
 
 # Get database URL from settings
 settings = Settings()
-database_url = f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+database_url = settings.DATABASE_URL or f"postgresql+psycopg2://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
 # Override the database URL in config
 config.set_main_option("sqlalchemy.url", database_url)
@@ -37,6 +38,14 @@ config.set_main_option("sqlalchemy.url", database_url)
 # for 'autogenerate' support
 target_metadata = SQLModel.metadata
 
+
+def include_name(name, type_, parent_names):
+    # Hourly authorization_codes partitions are created and dropped at runtime
+    # (app/partitions.py); autogenerate must not try to drop them
+    if type_ == "table":
+        return not is_partition(name)
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,6 +70,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -82,7 +92,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
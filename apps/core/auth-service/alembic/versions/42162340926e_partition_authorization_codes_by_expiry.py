@@ -0,0 +1,104 @@
+"""partition authorization_codes by expires_at
+
+Revision ID: 42162340926e
+Revises: c5730f3adc43
+Create Date: 2026-10-18 09:00:00.000000
+
+Rebuilds authorization_codes as a table range-partitioned by expires_at
+into hourly partitions, so expiry becomes a partition drop (see
+app/partitions.py) instead of row deletes and vacuum.
+
+Postgres requires unique constraints on a partitioned table to include
+the partition key, so the primary key becomes (id, expires_at) and the
+unique index on code becomes (code, expires_at). Codes are 256-bit random
+values, so uniqueness of code alone is still guaranteed in practice.
+
+A DEFAULT partition catches rows outside the pre-created hours; the
+reaper's chunked DELETE keeps it small. Live codes (at most 5 minutes
+old) are copied across.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '42162340926e'
+down_revision: Union[str, Sequence[str], None] = 'c5730f3adc43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Hourly partitions created up front; the reaper keeps creating them after this
+INITIAL_HOURS = 24
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE authorization_codes RENAME TO authorization_codes_unpartitioned")
+    op.execute("ALTER INDEX ix_authorization_codes_code RENAME TO ix_authorization_codes_unpartitioned_code")
+    op.execute("ALTER INDEX ix_authorization_codes_expires_at RENAME TO ix_authorization_codes_unpartitioned_expires_at")
+    op.execute("ALTER INDEX ix_authorization_codes_used RENAME TO ix_authorization_codes_unpartitioned_used")
+    op.execute("ALTER TABLE authorization_codes_unpartitioned RENAME CONSTRAINT authorization_codes_pkey TO authorization_codes_unpartitioned_pkey")
+
+    # LIKE ... INCLUDING DEFAULTS keeps id's nextval() default on the same sequence
+    op.execute("""
+        CREATE TABLE authorization_codes (
+            LIKE authorization_codes_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT authorization_codes_pkey PRIMARY KEY (id, expires_at)
+        ) PARTITION BY RANGE (expires_at)
+    """)
+    op.execute("ALTER SEQUENCE authorization_codes_id_seq OWNED BY authorization_codes.id")
+    op.execute("CREATE UNIQUE INDEX ix_authorization_codes_code ON authorization_codes (code, expires_at)")
+    op.execute("CREATE INDEX ix_authorization_codes_expires_at ON authorization_codes (expires_at)")
+    op.execute("CREATE INDEX ix_authorization_codes_used ON authorization_codes (used)")
+    op.execute("CREATE TABLE authorization_codes_default PARTITION OF authorization_codes DEFAULT")
+
+    # Same naming as app/partitions.py: authorization_codes_pYYYYMMDDHH
+    op.execute(f"""
+        DO $$
+        DECLARE
+            start_at timestamp := date_trunc('hour', localtimestamp);
+        BEGIN
+            FOR i IN 0..{INITIAL_HOURS} LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF authorization_codes FOR VALUES FROM (%L) TO (%L)',
+                    'authorization_codes_p' || to_char(start_at + i * interval '1 hour', 'YYYYMMDDHH24'),
+                    start_at + i * interval '1 hour',
+                    start_at + (i + 1) * interval '1 hour'
+                );
+            END LOOP;
+        END $$
+    """)
+
+    op.execute("""
+        INSERT INTO authorization_codes
+        SELECT * FROM authorization_codes_unpartitioned
+        WHERE expires_at > localtimestamp
+    """)
+    op.execute("DROP TABLE authorization_codes_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE authorization_codes RENAME TO authorization_codes_partitioned")
+    op.execute("ALTER INDEX ix_authorization_codes_code RENAME TO ix_authorization_codes_partitioned_code")
+    op.execute("ALTER INDEX ix_authorization_codes_expires_at RENAME TO ix_authorization_codes_partitioned_expires_at")
+    op.execute("ALTER INDEX ix_authorization_codes_used RENAME TO ix_authorization_codes_partitioned_used")
+    op.execute("ALTER TABLE authorization_codes_partitioned RENAME CONSTRAINT authorization_codes_pkey TO authorization_codes_partitioned_pkey")
+
+    op.execute("""
+        CREATE TABLE authorization_codes (
+            LIKE authorization_codes_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            CONSTRAINT authorization_codes_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE authorization_codes_id_seq OWNED BY authorization_codes.id")
+    op.execute("CREATE UNIQUE INDEX ix_authorization_codes_code ON authorization_codes (code)")
+    op.execute("CREATE INDEX ix_authorization_codes_expires_at ON authorization_codes (expires_at)")
+    op.execute("CREATE INDEX ix_authorization_codes_used ON authorization_codes (used)")
+
+    op.execute("""
+        INSERT INTO authorization_codes
+        SELECT * FROM authorization_codes_partitioned
+        WHERE expires_at > localtimestamp
+    """)
+    op.execute("DROP TABLE authorization_codes_partitioned")
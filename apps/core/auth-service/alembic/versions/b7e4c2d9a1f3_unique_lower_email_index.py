@@ -0,0 +1,59 @@
+"""unique lower(email) index covering id and password_hash
+
+Revision ID: b7e4c2d9a1f3
+Revises: 8d3f1a6b2c47
+Create Date: 2026-10-18 15:00:00.000000
+
+Replaces the plain ix_users_email with a unique index on lower(email)
+that INCLUDEs id and password_hash, so the login lookup is an index-only
+scan and duplicate emails (in any case) are rejected by the database.
+email is INCLUDEd as well: Postgres only plans an index-only scan when
+every column the query references, including the one inside lower(), can
+be read from the index.
+
+Existing emails are lowercased first. If two accounts differ only by case
+the migration stops and lists them; merge or rename them and re-run.
+
+Both indexes are built/dropped CONCURRENTLY, outside the migration
+transaction, so logins and signups are not blocked on a large table. An
+interrupted concurrent build leaves an INVALID index behind; the upgrade
+drops it before retrying.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4c2d9a1f3'
+down_revision: Union[str, Sequence[str], None] = '8d3f1a6b2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text(
+        "SELECT lower(email), count(*) FROM users GROUP BY lower(email) HAVING count(*) > 1 LIMIT 20"
+    )).fetchall()
+    if duplicates:
+        listed = ", ".join(f"{email} ({count})" for email, count in duplicates)
+        raise RuntimeError(f"Emails registered more than once ignoring case: {listed}")
+
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY ix_users_email_lower "
+            "ON users (lower(email)) INCLUDE (email, id, password_hash)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email ON users (email)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email_lower")
@@ -0,0 +1,100 @@
+"""
+Account operations shared by the HTTP API and the gRPC server.
+
+Handlers translate the results into their own transport: HTTPException
+for FastAPI, status codes for gRPC.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import is_postgres
+from app.models.user import User
+from app.security.hashing import HashingBusy
+from app.security.password import hash_password_async, needs_rehash, verify_password_async
+
+
+class EmailAlreadyRegistered(Exception):
+    pass
+
+
+def normalize_email(email: str) -> str:
+    """Emails are stored and compared lowercased, matching the lower(email) unique index"""
+    return email.strip().lower()
+
+
+def email_matches(email: str):
+    """WHERE clause served by ix_users_email_lower; email must already be normalized"""
+    return func.lower(User.email) == email
+
+
+def _insert(*args, **kwargs):
+    insert = postgresql_insert if is_postgres() else sqlite_insert
+    return insert(*args, **kwargs)
+
+
+async def register_user(session: AsyncSession, email: str, password: str):
+    """
+    Create a user and return its (id, email) row.
+    Raises EmailAlreadyRegistered if the email is taken.
+    """
+    email = normalize_email(email)
+
+    # Index-only probe, so a duplicate signup does not pay for an argon2 hash
+    existing_user = (await session.exec(
+        select(User.id).where(email_matches(email))
+    )).first()
+
+    if existing_user:
+        raise EmailAlreadyRegistered(email)
+
+    password_hash = await hash_password_async(password)
+
+    # One statement; a signup racing us for the same email gets no row back
+    # instead of an IntegrityError and a rolled back transaction
+    statement = (
+        _insert(User)
+        .values(email=email, password_hash=password_hash)
+        .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+        .returning(User.id, User.email)
+    )
+    user = (await session.exec(statement)).first()
+    await session.commit()
+
+    if user is None:
+        raise EmailAlreadyRegistered(email)
+
+    return user
+
+
+async def authenticate(session: AsyncSession, email: str, password: str) -> Optional[uuid.UUID]:
+    """Check credentials, returning the user's id or None"""
+    # Only the indexed key and its INCLUDEd columns are read, so Postgres
+    # answers this with an index-only scan on ix_users_email_lower
+    user = (await session.exec(
+        select(User.id, User.password_hash).where(email_matches(normalize_email(email)))
+    )).first()
+
+    if not user or not await verify_password_async(user.password_hash, password):
+        return None
+
+    # Upgrade hashes made with old argon2 parameters while we have the plaintext
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await hash_password_async(password)
+            # password_hash is not a profile claim, so skipping the ORM
+            # (and its cache invalidation events) is fine here
+            await session.exec(
+                update(User).where(User.id == user.id).values(password_hash=new_hash)
+            )
+            await session.commit()
+        except HashingBusy:
+            # Not worth failing a valid login over; retried on the next login
+            pass
+
+    return user.id
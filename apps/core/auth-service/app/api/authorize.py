@@ -1,18 +1,18 @@
 from fastapi.responses import RedirectResponse
 from fastapi.exceptions import HTTPException
 from fastapi import APIRouter, Query, Depends
-from sqlmodel import Session, select
 import secrets
 from datetime import timedelta, datetime
 
-from ..database import get_session
 from ..models.oauth import AuthorizationCode
+from ..oauth.codes import get_code_store
 from ..security.session import get_current_user
+from ..stats import events
 
 router = APIRouter()
 
 @router.get("/authorize")
-def authorize(
+async def authorize(
     response_type: str = Query(..., description="Response type"),
     client_id: str = Query(..., description="Client ID"),
     redirect_uri: str = Query(..., description="Redirect URI"),
@@ -20,7 +20,6 @@ def authorize(
     state: str = Query(..., description="State"),
     code_challenge: str = Query(..., description="Code challenge"),
     code_challenge_method: str = Query(..., description="Code challenge method"),
-    session: Session = Depends(get_session),
     user_id: str = Depends(get_current_user)
 ):
     if response_type != "code":
@@ -39,7 +38,7 @@ def authorize(
 
     code = secrets.token_urlsafe(32)
 
-    # Create authorization code in database
+    # Hand the code to the configured store (database, memory or Redis)
     auth_code = AuthorizationCode(
         code=code,
         client_id=client_id,
@@ -50,9 +49,9 @@ def authorize(
         redirect_uri=redirect_uri,
         expires_at=datetime.now() + timedelta(minutes=5)
     )
-    
-    session.add(auth_code)
-    session.commit()
+
+    code = await get_code_store().save(auth_code)
+    events.record("code_issued")
 
     redirect_uri = f"{redirect_uri}?code={code}"
 
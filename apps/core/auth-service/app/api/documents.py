@@ -0,0 +1,35 @@
+"""
+Pre-serialized JSON documents served with a strong ETag and conditional GET.
+"""
+import hashlib
+import json
+from typing import Optional
+from fastapi import Request, Response
+
+
+class CachedDocument:
+    """A JSON document serialized to bytes once, with its ETag."""
+
+    def __init__(self, document: dict, max_age: int):
+        self.body = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={max_age}",
+        }
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against this document's ETag"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+    def respond(self, request: Request) -> Response:
+        """Serve the document, or 304 Not Modified if the client already has it"""
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
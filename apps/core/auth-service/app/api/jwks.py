@@ -1,29 +1,70 @@
-import json
-from fastapi import APIRouter
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
+from fastapi import APIRouter, Request
 import base64
+from typing import Optional
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from ..config.settings import Settings
+from ..oauth.keyring import Key, KeyRing, keyring
+from .documents import CachedDocument
 
 router = APIRouter()
 
-KID = "nucleus-auth-1"
+settings = Settings()
+
+_document: Optional[CachedDocument] = None
 
 def to_base64url(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode('utf-8').rstrip('=')
 
-@router.get("/jwks.json", description="JSON Web Key Set")
-def jwks():
-    with open("app/keys/public.pem", "rb") as f:
-        public_key = serialization.load_pem_public_key(f.read(), backend=default_backend())
-
-        numbers = public_key.public_numbers()  # ty:ignore[possibly-missing-attribute]
+def to_jwk(key: Key) -> dict:
+    jwk = {
+        "kid": key.kid,
+        "use": "sig",
+        "alg": key.alg,
+    }
+    public_key = key.public_key
 
-        jwk = {
+    if isinstance(public_key, rsa.RSAPublicKey):
+        numbers = public_key.public_numbers()
+        jwk.update({
             "kty": "RSA",
-            "kid": KID,
-            "use": "sig",
-            "alg": "RS256",
             "n": to_base64url(numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, 'big')),
             "e": to_base64url(numbers.e.to_bytes((numbers.e.bit_length() + 7) // 8, 'big'))
-        }
-        return {"keys": [jwk]}
+        })
+    elif isinstance(public_key, ec.EllipticCurvePublicKey):
+        numbers = public_key.public_numbers()
+        size = (public_key.curve.key_size + 7) // 8
+        jwk.update({
+            "kty": "EC",
+            "crv": "P-256",
+            "x": to_base64url(numbers.x.to_bytes(size, 'big')),
+            "y": to_base64url(numbers.y.to_bytes(size, 'big'))
+        })
+    elif isinstance(public_key, ed25519.Ed25519PublicKey):
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        jwk.update({
+            "kty": "OKP",
+            "crv": "Ed25519",
+            "x": to_base64url(raw)
+        })
+
+    return jwk
+
+def build_jwks(ring: KeyRing) -> None:
+    """Serialize the key set once; called at startup and on every key rotation"""
+    global _document
+    keys = sorted(ring.keys(), key=lambda k: k.kid)
+    _document = CachedDocument(
+        {"keys": [to_jwk(key) for key in keys]},
+        max_age=settings.JWKS_MAX_AGE,
+    )
+
+keyring.on_reload(build_jwks)
+
+@router.get("/jwks.json", description="JSON Web Key Set")
+def jwks(request: Request):
+    keyring.maybe_reload()
+    if _document is None:
+        build_jwks(keyring)
+    return _document.respond(request)  # ty:ignore[possibly-missing-attribute]
@@ -1,28 +1,24 @@
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import APIRouter, Depends, HTTPException, Body, Response
-from ..database import get_session
-from ..models import User
-from ..security.password import verify_password
+from ..database import get_async_session
+from ..accounts import authenticate
 from ..security.session import create_session
 
 router = APIRouter()
 
 
 @router.post("/login")
-def login(
+async def login(
     response: Response,
     email: str = Body(...),
     password: str = Body(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
-    user = session.exec(
-        statement=select(User).where(User.email == email)
-    ).first()
-
-    if not user or not verify_password(user.password_hash, password):
+    user_id = await authenticate(session, email, password)
+    if not user_id:
         raise HTTPException(status_code=401, detail="invalid_credential")
-    
-    session_token = create_session(str(user.id))
+
+    session_token = create_session(str(user_id))
 
     response.set_cookie(
         key="nucleus_session",
@@ -1,23 +1,49 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from typing import List, Optional
+
+from ..config.settings import Settings
+from ..oauth.keyring import SUPPORTED_ALGORITHMS, KeyRing, keyring
+from .documents import CachedDocument
 
 router = APIRouter()
 
-ISSUER = "http://localhost:8000"
+settings = Settings()
 
-@router.get("/.well-known/openid-configuration",
-    description="OpenID Connect configuration")
-def openid_configuration():
-    return {
+ISSUER = settings.ISSUER
+
+_discovery: Optional[CachedDocument] = None
+
+def signing_algorithms(ring: KeyRing) -> List[str]:
+    """Algorithms of the keys that sign ID tokens, including pre-published ones"""
+    algs = {key.alg for key in ring.keys() if key.can_sign}
+    return [alg for alg in SUPPORTED_ALGORITHMS if alg in algs]
+
+def build_discovery(ring: KeyRing) -> None:
+    """Serialize the discovery document; rebuilt when the key set changes"""
+    global _discovery
+    _discovery = CachedDocument({
         "issuer": ISSUER,
         "authorization_endpoint": f"{ISSUER}/authorize",
         "token_endpoint": f"{ISSUER}/token",
         "userinfo_endpoint": f"{ISSUER}/userinfo",
-        "jwks_uri": f"{ISSUER}/jwks",
+        "jwks_uri": f"{ISSUER}/jwks.json",
+        "introspection_endpoint": f"{ISSUER}/introspect",
+        "introspection_endpoint_auth_methods_supported": ["client_secret_basic"],
         "response_types_supported": ["code"],
         "subject_types_supported": ["public"],
-        "id_token_signing_alg_values_supported": ["RS256"],
+        "id_token_signing_alg_values_supported": signing_algorithms(ring),
         "scopes_supported": ["openid", "profile", "email", "address", "phone"],
         "token_endpoint_auth_methods_supported": ["client_secret_basic", "client_secret_post", "none"],
         "code_challenge_methods_supported": ["S256"],
         "claims_supported": ["sub", "name", "given_name", "family_name", "middle_name", "nickname", "preferred_username", "profile", "picture", "website", "email", "email_verified", "gender", "birthdate", "zoneinfo", "locale", "phone_number", "phone_number_verified", "address"]
-    }
+    }, max_age=settings.DISCOVERY_MAX_AGE)
+
+keyring.on_reload(build_discovery)
+
+@router.get("/.well-known/openid-configuration",
+    description="OpenID Connect configuration")
+def openid_configuration(request: Request):
+    keyring.maybe_reload()
+    if _discovery is None:
+        build_discovery(keyring)
+    return _discovery.respond(request)  # ty:ignore[possibly-missing-attribute]
@@ -1,79 +1,100 @@
-from fastapi import APIRouter, Form, HTTPException, Depends
-from sqlmodel import Session, select
-from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, Form, HTTPException
+from starlette.concurrency import run_in_threadpool
 
-from ..oauth.helper import verify_pkce, sign_jwt
-from ..database import get_session
-from ..models.oauth import AuthorizationCode
+from ..oauth.helper import ACCESS_TOKEN_LIFETIME, access_token_claims, verify_pkce, sign_jwt, sign_jwts
+from ..oauth.codes import get_code_store
+from ..oauth.refresh import issue_refresh_token, rotate_refresh_token
+from ..oidc.user_claims import user_claims
 from ..config.settings import Settings
+from ..stats import events
 
 router = APIRouter()
 
 @router.post("/token")
-def token(
+async def token(
     grant_type: str = Form(...),
-    code: str = Form(...),
-    redirect_uri: str = Form(...),
     client_id: str = Form(...),
-    code_verifier: str = Form(...),
-    session: Session = Depends(get_session),
+    code: Optional[str] = Form(None),
+    redirect_uri: Optional[str] = Form(None),
+    code_verifier: Optional[str] = Form(None),
+    refresh_token: Optional[str] = Form(None),
     settings: Settings = Settings()
 ):
-    if grant_type != "authorization_code":
-        raise HTTPException(status_code=400, detail="unsupported_grant_type")
+    if grant_type == "authorization_code":
+        if not (code and redirect_uri and code_verifier):
+            raise HTTPException(status_code=400, detail="invalid_request")
+        return await authorization_code_grant(code, redirect_uri, client_id, code_verifier, settings)
 
-    # Query authorization code from database
-    statement = select(AuthorizationCode).where(
-        AuthorizationCode.code == code,
-        AuthorizationCode.used == False
-    )
-    auth_code = session.exec(statement).first()
+    if grant_type == "refresh_token":
+        if not refresh_token:
+            raise HTTPException(status_code=400, detail="invalid_request")
+        return await refresh_token_grant(refresh_token, client_id)
 
+    raise HTTPException(status_code=400, detail="unsupported_grant_type")
+
+async def authorization_code_grant(code: str, redirect_uri: str, client_id: str, code_verifier: str, settings: Settings):
+    # Redemption is atomic in every store, so a code is exchanged at most once
+    auth_code = await get_code_store().redeem(code)
+
+    # The code is spent even if the checks below fail, as RFC 6749 expects
     if not auth_code:
         raise HTTPException(status_code=400, detail="invalid_code")
 
+    events.record("code_redeemed")
+
     if auth_code.client_id != client_id:
         raise HTTPException(status_code=400, detail="invalid_client")
 
     if auth_code.redirect_uri != redirect_uri:
         raise HTTPException(status_code=400, detail="invalid_redirect_uri")
 
-    if auth_code.expires_at < datetime.now():
-        raise HTTPException(status_code=400, detail="code_expired")
-
     if not verify_pkce(code_verifier, auth_code.code_challenge):
         raise HTTPException(status_code=400, detail="invalid_pkce")
 
-    # Mark code as used
-    auth_code.used = True
-    session.add(auth_code)
-    session.commit()
-
     user_id = auth_code.user_id
 
-    now = datetime.now()
-    exp = now + timedelta(minutes=15)
+    claims = access_token_claims(user_id, client_id, auth_code.scope)
 
-    access_token = sign_jwt({
-        "iss": settings.ISSUER,
-        "sub": user_id,
-        "aud": client_id,
-        "scope": auth_code.scope,
-        "exp": exp
-    })
+    profile_claims = await user_claims.get_claims(user_id, auth_code.scope.split())
+    if profile_claims is None:
+        raise HTTPException(status_code=400, detail="invalid_grant")
 
-    id_token = sign_jwt({
+    id_claims = {
         "iss": settings.ISSUER,
-        "sub": user_id,
+        **profile_claims,
         "aud": client_id,
-        "email": "dev@nucleus.local",
-        "email_verified": True,
-        "exp": exp
-    })
+        "exp": claims["exp"]
+    }
+
+    # Signing is CPU-bound (RS256 especially); keep it off the event loop,
+    # signing both tokens in one threadpool hop
+    access_token, id_token = await run_in_threadpool(sign_jwts, [claims, id_claims])
 
     return {
         "access_token": access_token,
         "id_token": id_token,
+        "refresh_token": await issue_refresh_token(user_id, client_id, auth_code.scope),
+        "token_type": "Bearer",
+        "expires_in": int(ACCESS_TOKEN_LIFETIME.total_seconds())
+    }
+
+async def refresh_token_grant(refresh_token: str, client_id: str):
+    # One indexed UPDATE spends the old token and the successor is inserted in
+    # the same transaction; no password verify and no code round trip
+    rotated = await rotate_refresh_token(refresh_token, client_id)
+    if not rotated:
+        raise HTTPException(status_code=400, detail="invalid_refresh_token")
+
+    new_refresh_token, spent = rotated
+    events.record("refresh_rotated")
+
+    claims = access_token_claims(spent.user_id, client_id, spent.scope)
+    access_token = await run_in_threadpool(sign_jwt, claims)
+
+    return {
+        "access_token": access_token,
+        "refresh_token": new_refresh_token,
         "token_type": "Bearer",
-        "expires_in": 900
+        "expires_in": int(ACCESS_TOKEN_LIFETIME.total_seconds())
     }
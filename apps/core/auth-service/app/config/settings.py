@@ -1,3 +1,4 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,9 +7,81 @@ class Settings(BaseSettings):
     DB_USER: str = "nucleus"
     DB_PASSWORD: str = "nucleus"
     DB_NAME: str = "nucleus"
+    # Full SQLAlchemy URL overriding the DB_* parts above (e.g. sqlite:///bench.db for benchmarks)
+    DATABASE_URL: Optional[str] = None
+
+    # Engine profile ("dev" or "prod"); the DB_* tunables below override its defaults
+    DB_PROFILE: str = "prod"
+    DB_ECHO: Optional[bool] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[float] = None  # seconds to wait for a pooled connection
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_POOL_RECYCLE: Optional[int] = None  # seconds
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = None  # 0 disables
+    DB_LOCK_TIMEOUT_MS: Optional[int] = None  # 0 disables
 
     ISSUER: str = "https://nucleus.example.com"
     KID: str = "nucleus-auth-1"
     JWKS_URL: str = "http://localhost:8000/.well-known/jwks.json"
 
+    # Signing keys
+    KEYS_DIR: str = "app/keys"
+    SIGNING_KID: Optional[str] = None  # defaults to the newest private key past KEY_PREPUBLISH_SECONDS
+    KEY_RELOAD_INTERVAL: float = 5.0  # seconds between key file mtime checks
+    KEY_PREPUBLISH_SECONDS: Optional[float] = None  # seconds a new key is in the JWKS before it signs; defaults to JWKS_MAX_AGE + KEY_RELOAD_INTERVAL
+
+    # Cache lifetimes for the published discovery documents (seconds)
+    JWKS_MAX_AGE: int = 300
+    DISCOVERY_MAX_AGE: int = 3600
+
+    # Local token verification
+    VERIFY_KEYS_TTL: float = 300.0  # seconds before the kid -> key map is re-read; key ring reloads replace it at once
+    UNKNOWN_KID_TTL: float = 60.0  # seconds an unknown kid is rejected without a refresh
+    CLAIMS_CACHE_SIZE: int = 10000  # verified tokens kept in memory, 0 disables the cache
+    CLAIMS_CACHE_TTL: float = 60.0  # upper bound on how long verified claims are reused
+    USER_CLAIMS_CACHE_SIZE: int = 10000  # user profiles kept for /userinfo and id_tokens, 0 disables
+    USER_CLAIMS_CACHE_TTL: float = 300.0  # seconds; bounds staleness on replicas that did not make a change
+    INTROSPECT_MAX_BATCH: int = 1000  # tokens accepted per batch introspection / ValidateTokens call
+    # client_id -> secret for callers of /introspect and ValidateToken(s), as JSON
+    # (e.g. {"api-gateway": "..."}); HTTP Basic on both. Empty rejects every caller
+    INTROSPECT_CLIENTS: Dict[str, str] = {}
+
+    # Refresh tokens: rotated on every use, each one valid for this long (seconds)
+    REFRESH_TOKEN_TTL: int = 30 * 24 * 3600
+
+    # Authorization code storage: "sql", "memory" (single replica), "redis"
+    # or "stateless" (encrypted self-contained codes, single replica). Only the
+    # code store skips the database: /token still inserts a refresh token and
+    # reads the user's profile claims in every mode
+    CODE_STORE: str = "sql"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CODE_ENCRYPTION_KEY: Optional[str] = None  # base64url AES key (16/24/32 bytes) for "stateless"
+
+    # Expired code and refresh token reaper (codes are only reaped with CODE_STORE=sql)
+    REAPER_ENABLED: bool = True
+    REAPER_INTERVAL: float = 60.0  # seconds between runs
+    REAPER_JITTER: float = 10.0  # random extra seconds added to each interval
+    REAPER_CHUNK_SIZE: int = 5000  # rows deleted per transaction
+    PARTITION_HOURS_AHEAD: int = 24  # hourly code partitions kept pre-created, if partitioned
+
+    STATS_CACHE_TTL: float = 10.0  # seconds /admin/db-stats results are reused
+
+    # Argon2 parameters; tune with `python manage.py calibrate-hashing`
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
+    # Password hashing executor
+    HASHING_MODE: str = "thread"  # "thread" or "process"
+    HASHING_WORKERS: int = 2
+    HASHING_QUEUE_SIZE: int = 32  # hashes allowed to wait before returning 503
+    HASHING_RETRY_AFTER: int = 1  # seconds, sent as Retry-After on 503
+
+    # gRPC AuthServiceV1, served alongside the HTTP app (or alone via `python -m app.rpc`)
+    GRPC_ENABLED: bool = False
+    GRPC_PORT: int = 50051
+    GRPC_AUDIENCE: str = "nucleus-internal"  # aud of access tokens issued by Signup/Login
+    GRPC_MAX_CONCURRENT_RPCS: Optional[int] = None  # excess RPCs fail with RESOURCE_EXHAUSTED
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -1,33 +1,155 @@
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
 from functools import lru_cache
 from .config.settings import Settings
+from .metrics import instrument_engine
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-# Global engine variable
+# Engine defaults per DB_PROFILE; any DB_* setting that is set overrides them
+ENGINE_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30.0,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 0,
+        "lock_timeout_ms": 0,
+    },
+    "prod": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 5,
+        "pool_timeout": 5.0,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "statement_timeout_ms": 5000,
+        "lock_timeout_ms": 2000,
+    },
+}
+
+# Global engine variables
 engine = None
+async_engine = None
 
 @lru_cache
 def get_settings():
     return Settings()
 
+# Async driver used for each sync URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 def get_database_url() -> str:
     """Construct database URL from settings"""
     settings = get_settings()
+    if settings.DATABASE_URL:
+        return settings.DATABASE_URL
     return f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
 
+def get_async_database_url() -> str:
+    """Construct async (asyncpg/aiosqlite) database URL from settings"""
+    scheme, rest = get_database_url().split("://", 1)
+    if scheme not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for database URL scheme: {scheme}")
+    return f"{ASYNC_DRIVERS[scheme]}://{rest}"
+
+def is_postgres() -> bool:
+    return get_database_url().startswith("postgresql")
+
+def get_engine_options() -> dict:
+    """Resolve engine options from the DB_PROFILE defaults and DB_* overrides"""
+    settings = get_settings()
+    if settings.DB_PROFILE not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE: {settings.DB_PROFILE}")
+
+    options = dict(ENGINE_PROFILES[settings.DB_PROFILE])
+    overrides = {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        "lock_timeout_ms": settings.DB_LOCK_TIMEOUT_MS,
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    return options
+
+def _server_settings(options: dict) -> dict:
+    """Server-side timeouts applied to every new connection (0 disables)"""
+    server_settings = {}
+    if options["statement_timeout_ms"]:
+        server_settings["statement_timeout"] = str(options["statement_timeout_ms"])
+    if options["lock_timeout_ms"]:
+        server_settings["lock_timeout"] = str(options["lock_timeout_ms"])
+    return server_settings
+
+def _pool_kwargs(options: dict) -> dict:
+    return {
+        "echo": options["echo"],
+        "pool_size": options["pool_size"],
+        "max_overflow": options["max_overflow"],
+        "pool_timeout": options["pool_timeout"],
+        "pool_pre_ping": options["pool_pre_ping"],
+        "pool_recycle": options["pool_recycle"],
+    }
+
 def create_db_engine():
     """Create and return SQLModel engine"""
     database_url = get_database_url()
-    return create_engine(database_url, echo=True)
+    options = get_engine_options()
+    server_settings = _server_settings(options) if is_postgres() else {}
+    connect_args = {}
+    if server_settings:
+        connect_args["options"] = " ".join(f"-c {key}={value}" for key, value in server_settings.items())
+    db_engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        connect_args=connect_args,
+        **_pool_kwargs(options),
+    )
+    instrument_engine(db_engine, "sync")
+    return db_engine
+
+def create_async_db_engine():
+    """Create and return the async engine used by request handlers"""
+    database_url = get_async_database_url()
+    options = get_engine_options()
+    server_settings = _server_settings(options) if is_postgres() else {}
+    connect_args = {"server_settings": server_settings} if server_settings else {}
+    db_engine = create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=connect_args,
+        **_pool_kwargs(options),
+    )
+    instrument_engine(db_engine.sync_engine, "async")
+    return db_engine
 
 def init_db():
     """Initialize database connection (migrations handle schema)"""
-    global engine
+    global engine, async_engine
     engine = create_db_engine()
+    async_engine = create_async_db_engine()
     # Note: Table creation is now handled by Alembic migrations
     # Run: alembic upgrade head
 
+async def close_db():
+    """Dispose of pooled connections on shutdown"""
+    global async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+
 def get_session():
-    """Get database session"""
+    """Get database session (sync path, used by manage.py and admin endpoints)"""
     global engine
     if engine is None:
         engine = create_db_engine()
@@ -35,9 +157,35 @@ def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_async_session():
+    """Get async database session for request handlers"""
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
 def get_engine():
     """Get database engine"""
     global engine
     if engine is None:
         engine = create_db_engine()
-    return engine
\ No newline at end of file
+    return engine
+
+def get_async_engine():
+    """Get async database engine"""
+    global async_engine
+    if async_engine is None:
+        async_engine = create_async_db_engine()
+    return async_engine
+
+def get_pool_metrics() -> dict:
+    """Pool occupancy and wait counters for each engine this process has created"""
+    options = get_engine_options()
+    metrics = {
+        "profile": get_settings().DB_PROFILE,
+        "max_connections_per_engine": options["pool_size"] + options["max_overflow"],
+    }
+    for name, current in (("sync", engine), ("async", async_engine)):
+        if current is None:
+            continue
+        pool = current.pool if name == "sync" else current.sync_engine.pool
+        metrics[name] = pool.metrics() if isinstance(pool, InstrumentedQueuePool) else {"status": pool.status()}
+    return metrics
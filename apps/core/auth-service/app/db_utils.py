@@ -1,33 +1,66 @@
 """
 Database utility functions for SQLModel operations
 """
-from sqlmodel import Session, select
+import time
+from typing import Optional
+from sqlmodel import Session, select, delete
 from .database import get_engine
-from .models.oauth import AuthorizationCode
+from .models.oauth import AuthorizationCode, RefreshToken
 from datetime import datetime
 
-def cleanup_expired_codes():
-    """Remove expired authorization codes from database"""
-    engine = get_engine()
-    with Session(engine) as session:
-        statement = select(AuthorizationCode).where(
-            AuthorizationCode.expires_at < datetime.now()
-        )
-        expired_codes = session.exec(statement).all()
-        
-        for code in expired_codes:
-            session.delete(code)
-        
-        session.commit()
-        return len(expired_codes)
+DEFAULT_CHUNK_SIZE = 5000
 
-def get_active_codes_count():
-    """Get count of active (non-expired, unused) authorization codes"""
+def delete_expired_chunk(session: Session, chunk_size: int, now: datetime, model=AuthorizationCode) -> int:
+    """Delete up to chunk_size expired rows of model in one statement and commit"""
+    # The subquery walks the expires_at index; SKIP LOCKED lets several
+    # replicas reap at once without queueing on each other's rows
+    expired_ids = (
+        select(model.id)
+        .where(model.expires_at < now)
+        .limit(chunk_size)
+        .with_for_update(skip_locked=True)
+    )
+    statement = delete(model).where(
+        model.id.in_(expired_ids.scalar_subquery())  # ty:ignore[possibly-missing-attribute]
+    )
+    result = session.exec(statement)
+    session.commit()
+    return result.rowcount
+
+def _cleanup_expired(model, chunk_size: int, max_chunks: Optional[int]) -> dict:
+    # A chunk that can never come back short would loop forever
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
     engine = get_engine()
+    now = datetime.now()
+    started = time.perf_counter()
+    deleted = 0
+    chunks = 0
+
     with Session(engine) as session:
-        statement = select(AuthorizationCode).where(
-            AuthorizationCode.expires_at > datetime.now(),
-            AuthorizationCode.used == False
-        )
-        codes = session.exec(statement).all()
-        return len(codes)
\ No newline at end of file
+        while max_chunks is None or chunks < max_chunks:
+            count = delete_expired_chunk(session, chunk_size, now, model)
+            chunks += 1
+            deleted += count
+            if count < chunk_size:
+                break
+
+    seconds = time.perf_counter() - started
+    return {
+        "deleted": deleted,
+        "chunks": chunks,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(deleted / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+def cleanup_expired_codes(chunk_size: int = DEFAULT_CHUNK_SIZE, max_chunks: Optional[int] = None) -> dict:
+    """
+    Remove expired authorization codes from database in chunks.
+    Each chunk is its own transaction, so locks are held briefly and
+    memory use does not grow with the backlog.
+    """
+    return _cleanup_expired(AuthorizationCode, chunk_size, max_chunks)
+
+def cleanup_expired_refresh_tokens(chunk_size: int = DEFAULT_CHUNK_SIZE, max_chunks: Optional[int] = None) -> dict:
+    """Remove expired refresh tokens in chunks (used ones are kept until expiry for reuse detection)"""
+    return _cleanup_expired(RefreshToken, chunk_size, max_chunks)
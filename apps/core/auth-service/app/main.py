@@ -1,34 +1,111 @@
+import asyncio
+import signal
 from contextlib import asynccontextmanager
 from functools import lru_cache
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from sqlmodel import Session
 from .config import settings
-from .database import init_db, get_engine, get_session
+from .database import init_db, close_db, get_engine, get_session, get_pool_metrics
 from .models import AuthorizationCode  # Import models to register them
-from .db_utils import cleanup_expired_codes, get_active_codes_count
+from .db_utils import cleanup_expired_codes
+from .metrics import MetricsMiddleware, register_stats, render_metrics
+from .reaper import Reaper
+from .stats import CachedStats
+from .oauth.codes import close_code_store
+from .oauth.keyring import keyring
+from .oidc.verify import claims_cache
+from .oidc.user_claims import user_claims
+from .rpc import start_grpc_server
+from .security.hashing import HashingBusy
+from .security.password import hashing_executor
 
 # APIs
 from .api.router import app as api_routes
 from .oidc.userinfo import router as userinfo_router
+from .oidc.introspect import router as introspect_router
+
+@lru_cache
+def get_settings():
+    return settings.Settings()
+
+reaper = Reaper(
+    interval=get_settings().REAPER_INTERVAL,
+    chunk_size=get_settings().REAPER_CHUNK_SIZE,
+    jitter=get_settings().REAPER_JITTER,
+    partition_hours_ahead=get_settings().PARTITION_HOURS_AHEAD,
+    reap_codes=get_settings().CODE_STORE == "sql",
+)
+
+db_stats_cache = CachedStats(ttl=get_settings().STATS_CACHE_TTL)
+
+grpc_server = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global grpc_server
     # Startup
     print("Starting up...")
     init_db()
     print("Database initialized")
+    keyring.load()
+    print(f"Signing keys loaded (active kid: {keyring.signing_key().kid})")
+    try:
+        # SIGHUP forces a key reload, e.g. after a rotation script writes new keys
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload_keys_on_signal)
+    except (NotImplementedError, AttributeError, RuntimeError):
+        pass
+    if get_settings().REAPER_ENABLED:
+        reaper.start()
+        print(f"Expired code reaper started (every {reaper.interval}s)")
+    if get_settings().GRPC_ENABLED:
+        grpc_server = await start_grpc_server(get_settings().GRPC_PORT, get_settings().GRPC_MAX_CONCURRENT_RPCS)
+        print(f"gRPC server listening on port {get_settings().GRPC_PORT}")
     yield
     # Shutdown
     print("Shutting down...")
+    if grpc_server is not None:
+        await grpc_server.stop(grace=5)
+    await reaper.stop()
+    await close_code_store()
+    await close_db()
+    hashing_executor.shutdown()
 
 app = FastAPI(title="Nucleus Auth Service", lifespan=lifespan)
 
+app.add_middleware(MetricsMiddleware)
+register_stats({
+    "claims_cache": claims_cache.stats,
+    "user_claims": user_claims.stats,
+    "hashing": hashing_executor.stats,
+    "db_pool": get_pool_metrics,
+    "keyring": keyring.stats,
+})
+
 app.include_router(api_routes)
 app.include_router(userinfo_router)
+app.include_router(introspect_router)
 
-@lru_cache
-def get_settings():
-    return settings.Settings()
+@app.exception_handler(HashingBusy)
+async def hashing_busy_handler(request: Request, exc: HashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "hashing_overloaded"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+def reload_keys():
+    """Reload signing keys from disk; on a bad key file the current keys stay in service"""
+    changed = keyring.reload()
+    print(f"Signing keys reloaded (changed: {changed}, active kid: {keyring.signing_key().kid})")
+    return changed
+
+def reload_keys_on_signal():
+    try:
+        reload_keys()
+    except Exception:
+        # Already reported by the key ring; a signal handler has nobody to tell
+        pass
 
 @app.get("/health")
 def health():
@@ -36,18 +113,72 @@ def health():
         "status": "ok"
     }
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/admin/db-stats")
 def db_stats():
     """Get database statistics"""
-    active_codes = get_active_codes_count()
-    return {
-        "active_authorization_codes": active_codes
-    }
+    return db_stats_cache.get()
+
+@app.get("/admin/db-pool")
+def db_pool():
+    """Get connection pool occupancy and wait counts"""
+    return get_pool_metrics()
+
+@app.get("/admin/token-cache")
+def token_cache_stats():
+    """Get verified-claims cache statistics"""
+    return claims_cache.stats()
+
+@app.get("/admin/user-claims-cache")
+def user_claims_cache_stats():
+    """Get user profile cache statistics"""
+    return user_claims.stats()
+
+@app.get("/admin/hashing")
+def hashing_stats():
+    """Get password hashing queue depth and latency"""
+    return hashing_executor.stats()
+
+@app.get("/admin/reaper")
+def reaper_stats():
+    """Get expired code reaper statistics"""
+    return reaper.stats()
 
 @app.post("/admin/cleanup")
 def cleanup_expired():
     """Clean up expired authorization codes"""
-    cleaned_count = cleanup_expired_codes()
+    result = cleanup_expired_codes(reaper.chunk_size)
+    return {
+        "message": f"Cleaned up {result['deleted']} expired authorization codes",
+        **result
+    }
+
+@app.get("/admin/keys")
+def key_ring_stats():
+    """Get the active signing key and any failed background reload"""
+    return keyring.stats()
+
+@app.post("/admin/keys/reload")
+def reload_signing_keys():
+    """Reload signing keys from disk without a restart"""
+    try:
+        changed = reload_keys()
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "error": "key_reload_failed",
+                "message": str(e),
+                "active_kid": keyring.signing_key().kid,
+            }
+        )
     return {
-        "message": f"Cleaned up {cleaned_count} expired authorization codes"
+        "changed": changed,
+        "active_kid": keyring.signing_key().kid,
+        "kids": [key.kid for key in keyring.keys()]
     }
@@ -0,0 +1,168 @@
+"""
+Prometheus instrumentation.
+
+- MetricsMiddleware: per-route request latency histogram and in-flight gauge
+- stage_timer(): latency of hot stages inside handlers (argon2, JWT sign/verify)
+- instrument_engine(): per-statement DB round-trip latency via SQLAlchemy events
+- StatsCollector: exports the counters the admin endpoints already keep,
+  read only at scrape time
+
+Everything is exposed by ``GET /metrics`` in the Prometheus text format.
+Metrics are per process; with several uvicorn workers, scrape each one.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+from sqlalchemy import event
+
+REQUEST_LATENCY = Histogram(
+    "nucleus_http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "nucleus_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    ["method"],
+)
+STAGE_LATENCY = Histogram(
+    "nucleus_stage_duration_seconds",
+    "Latency of hot stages inside request handlers",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_QUERY_LATENCY = Histogram(
+    "nucleus_db_query_duration_seconds",
+    "Database statement round-trip latency",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_QUERY_ERRORS = Counter(
+    "nucleus_db_query_errors_total",
+    "Database statements that raised",
+    ["engine"],
+)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block of work under the given stage label"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - started)
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    STAGE_LATENCY.labels(stage).observe(seconds)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so it adds no extra task or body buffering per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(method, path, str(status)).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Record the latency of every statement run on a (sync) engine"""
+    histogram = DB_QUERY_LATENCY.labels(name)
+    errors = DB_QUERY_ERRORS.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        histogram.observe(time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        errors.inc()
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+class StatsCollector:
+    """Exports existing in-process stats (caches, hashing queue, DB pools, key ring) at scrape time."""
+
+    def __init__(self, sources: Dict[str, Callable[[], dict]]):
+        self.sources = sources
+
+    def collect(self):
+        claims = self.sources["claims_cache"]()
+        for key in ("hits", "misses", "evictions", "expirations"):
+            yield CounterMetricFamily(f"nucleus_claims_cache_{key}", f"Verified-claims cache {key}", value=claims[key])
+        yield GaugeMetricFamily("nucleus_claims_cache_size", "Verified-claims cache entries", value=claims["size"])
+
+        profiles = self.sources["user_claims"]()
+        for key in ("hits", "misses", "loads", "coalesced", "evictions", "expirations", "invalidations"):
+            yield CounterMetricFamily(f"nucleus_user_claims_cache_{key}", f"User profile cache {key}", value=profiles[key])
+        yield GaugeMetricFamily("nucleus_user_claims_cache_size", "User profile cache entries", value=profiles["size"])
+
+        hashing = self.sources["hashing"]()
+        yield GaugeMetricFamily("nucleus_hashing_queue_depth", "Password hashes waiting for a worker", value=hashing["queue_depth"])
+        yield GaugeMetricFamily("nucleus_hashing_in_flight", "Password hashes queued or running", value=hashing["in_flight"])
+        yield CounterMetricFamily("nucleus_hashing_rejected", "Password hashes rejected with 503", value=hashing["rejected"])
+
+        pools = self.sources["db_pool"]()
+        checked_out = GaugeMetricFamily("nucleus_db_pool_checked_out", "Connections checked out", labels=["engine"])
+        overflow = GaugeMetricFamily("nucleus_db_pool_overflow", "Overflow connections open", labels=["engine"])
+        waits = CounterMetricFamily("nucleus_db_pool_waits", "Checkouts that waited for a connection", labels=["engine"])
+        timeouts = CounterMetricFamily("nucleus_db_pool_timeouts", "Checkouts that timed out", labels=["engine"])
+        for name in ("sync", "async"):
+            pool = pools.get(name)
+            if not pool or "checked_out" not in pool:
+                continue
+            checked_out.add_metric([name], pool["checked_out"])
+            overflow.add_metric([name], pool["overflow"])
+            waits.add_metric([name], pool["waits"])
+            timeouts.add_metric([name], pool["timeouts"])
+        yield checked_out
+        yield overflow
+        yield waits
+        yield timeouts
+
+        keys = self.sources["keyring"]()
+        yield CounterMetricFamily("nucleus_key_reload_failures", "Signing key reloads that failed and kept the previous keys", value=keys["reload_failures"])
+        yield GaugeMetricFamily("nucleus_key_reload_error", "1 while the last key reload failed", value=int(keys["last_error"] is not None))
+
+
+def register_stats(sources: Dict[str, Callable[[], dict]]) -> None:
+    REGISTRY.register(StatsCollector(sources))
+
+
+def render_metrics() -> tuple:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,4 +1,4 @@
-from .oauth import AuthorizationCode
+from .oauth import AuthorizationCode, RefreshToken
 from .user import User
 
-__all__ = ["AuthorizationCode", "User"]
\ No newline at end of file
+__all__ = ["AuthorizationCode", "RefreshToken", "User"]
\ No newline at end of file
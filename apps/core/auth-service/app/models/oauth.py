@@ -1,12 +1,20 @@
+from sqlalchemy import Index, PrimaryKeyConstraint, Sequence
+from sqlalchemy.ext.compiler import compiles
 from sqlmodel import Field, SQLModel
 from datetime import datetime
 from typing import Optional
 
 class AuthorizationCode(SQLModel, table=True):
     __tablename__ = "authorization_codes"
+    # Partitioned by expires_at (migration 42162340926e); Postgres requires
+    # the partition key in every unique constraint
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "expires_at", name="authorization_codes_pkey"),
+        Index("ix_authorization_codes_code", "code", "expires_at", unique=True),
+    )
 
-    id: Optional[int] = Field(default=None, primary_key=True)
-    code: str = Field(unique=True, index=True)
+    id: Optional[int] = Field(default=None, nullable=False, sa_column_args=[Sequence("authorization_codes_id_seq")])
+    code: str
     user_id: str
     client_id: str
     redirect_uri: str
@@ -16,3 +24,27 @@ class AuthorizationCode(SQLModel, table=True):
     expires_at: datetime = Field(index=True)  # Add index for efficient cleanup queries
     used: bool = Field(default=False, index=True)  # Add index for filtering
     created_at: datetime = Field(default_factory=datetime.now)
+
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _sqlite_primary_key(constraint, compiler, **kw):
+    # SQLite only assigns ids to a lone INTEGER PRIMARY KEY and has no
+    # partitions, so local databases (benchmarks, tests) key codes on id alone
+    if constraint.name == "authorization_codes_pkey":
+        return "PRIMARY KEY (id)"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+
+class RefreshToken(SQLModel, table=True):
+    __tablename__ = "refresh_tokens"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    token_hash: str = Field(unique=True, index=True)  # sha256 of the token; the token itself is never stored
+    family_id: str = Field(index=True)  # shared by every token rotated from the same grant
+    user_id: str
+    client_id: str
+    scope: str
+    expires_at: datetime = Field(index=True)
+    used: bool = Field(default=False)  # rotated; presenting it again revokes the family
+    revoked: bool = Field(default=False)
+    created_at: datetime = Field(default_factory=datetime.now)
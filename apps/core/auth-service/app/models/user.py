@@ -1,13 +1,24 @@
 from datetime import datetime
 import uuid
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
-
+    __table_args__ = (
+        # Case-insensitive uniqueness; on Postgres the INCLUDE columns make the
+        # login lookup an index-only scan (email itself must be included too,
+        # the planner will not use an expression index alone for that)
+        Index(
+            "ix_users_email_lower",
+            text("lower(email)"),
+            unique=True,
+            postgresql_include=["email", "id", "password_hash"],
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    email: str = Field(index=True, nullable=False)
+    email: str = Field(nullable=False)
     password_hash: str
     email_verified: bool = False
     created_at: datetime  = Field(default_factory=datetime.now)
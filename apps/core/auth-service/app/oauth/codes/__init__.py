@@ -0,0 +1,45 @@
+import base64
+import os
+from typing import Optional
+
+from app.config.settings import Settings
+from .base import CodeStore
+from .memory_store import MemoryCodeStore
+from .redis_store import RedisCodeStore
+from .sql_store import SQLCodeStore
+from .stateless_store import ReplayFilter, StatelessCodeStore
+
+__all__ = ["CodeStore", "MemoryCodeStore", "RedisCodeStore", "SQLCodeStore", "ReplayFilter", "StatelessCodeStore", "get_code_store", "close_code_store"]
+
+_store: Optional[CodeStore] = None
+
+def create_code_store(settings: Settings) -> CodeStore:
+    """Build the backend selected by CODE_STORE"""
+    if settings.CODE_STORE == "sql":
+        return SQLCodeStore()
+    if settings.CODE_STORE == "memory":
+        return MemoryCodeStore()
+    if settings.CODE_STORE == "redis":
+        return RedisCodeStore(settings.REDIS_URL)
+    if settings.CODE_STORE == "stateless":
+        if settings.CODE_ENCRYPTION_KEY:
+            key = base64.urlsafe_b64decode(settings.CODE_ENCRYPTION_KEY + "=" * (-len(settings.CODE_ENCRYPTION_KEY) % 4))
+        else:
+            # Codes still work within this process, but not across restarts or replicas
+            print("CODE_ENCRYPTION_KEY is not set; using a random per-process key")
+            key = os.urandom(32)
+        return StatelessCodeStore(key)
+    raise ValueError(f"Unknown CODE_STORE: {settings.CODE_STORE}")
+
+def get_code_store() -> CodeStore:
+    """Get the process-wide authorization code store"""
+    global _store
+    if _store is None:
+        _store = create_code_store(Settings())
+    return _store
+
+async def close_code_store() -> None:
+    global _store
+    if _store is not None:
+        await _store.close()
+        _store = None
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.models.oauth import AuthorizationCode
+
+
+class CodeStore(ABC):
+    """
+    Storage for short-lived, single-use authorization codes.
+
+    ``/authorize`` saves a code and ``/token`` redeems it. Redemption must be
+    atomic: of any number of concurrent ``redeem`` calls for the same code, at
+    most one gets the code back.
+    """
+
+    @abstractmethod
+    async def save(self, auth_code: AuthorizationCode) -> str:
+        """Store a code and return the value to hand to the client"""
+
+    @abstractmethod
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        """Consume a code; None if it is unknown, already used or expired"""
+
+    async def close(self) -> None:
+        """Release any connections held by the store"""
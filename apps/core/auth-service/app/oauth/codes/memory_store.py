@@ -0,0 +1,92 @@
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models.oauth import AuthorizationCode
+from .base import CodeStore
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: keys go into the slot for their expiry tick, and
+    advancing the clock drains only the slots that have passed. Expiry is
+    O(expired keys) rather than a scan of everything stored.
+    """
+
+    def __init__(self, tick: float, slots: int):
+        self.tick = tick
+        self.slots: List[Set[str]] = [set() for _ in range(slots)]
+        self._current = math.floor(time.monotonic() / tick)
+
+    def _tick_for(self, deadline: float) -> int:
+        return max(math.ceil(deadline / self.tick), self._current + 1)
+
+    def add(self, key: str, deadline: float) -> None:
+        self.slots[self._tick_for(deadline) % len(self.slots)].add(key)
+
+    def discard(self, key: str, deadline: float) -> None:
+        self.slots[self._tick_for(deadline) % len(self.slots)].discard(key)
+
+    def advance(self, now: float) -> List[str]:
+        """Return keys whose slot has come due since the last call"""
+        target = math.floor(now / self.tick)
+        due: List[str] = []
+        # Never sweep the wheel more than once around
+        start = max(self._current + 1, target - len(self.slots) + 1)
+        for tick in range(start, target + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if slot:
+                due.extend(slot)
+                slot.clear()
+        self._current = max(self._current, target)
+        return due
+
+
+class MemoryCodeStore(CodeStore):
+    """
+    Codes held in process memory with timer-wheel expiry.
+
+    No database writes at all, but codes only exist in the process that
+    issued them: use it with a single replica or sticky routing between
+    /authorize and /token.
+    """
+
+    def __init__(self, max_ttl: float = 600.0, tick: float = 1.0):
+        self._codes: Dict[str, Tuple[AuthorizationCode, float]] = {}
+        self._wheel = TimerWheel(tick=tick, slots=math.ceil(max_ttl / tick) + 1)
+
+    def _expire(self, now: float) -> None:
+        for code in self._wheel.advance(now):
+            entry = self._codes.get(code)
+            if entry is None:
+                continue
+            if entry[1] <= now:
+                del self._codes[code]
+            else:
+                # Deadline is further out than the wheel spans; go round again
+                self._wheel.add(code, entry[1])
+
+    async def save(self, auth_code: AuthorizationCode) -> str:
+        now = time.monotonic()
+        self._expire(now)
+        deadline = now + (auth_code.expires_at - datetime.now()).total_seconds()
+        self._codes[auth_code.code] = (auth_code, deadline)
+        self._wheel.add(auth_code.code, deadline)
+        return auth_code.code
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        now = time.monotonic()
+        self._expire(now)
+        entry = self._codes.pop(code, None)
+        if entry is None:
+            return None
+
+        auth_code, deadline = entry
+        self._wheel.discard(code, deadline)
+        if deadline <= now:
+            return None
+        return auth_code
+
+    def __len__(self) -> int:
+        return len(self._codes)
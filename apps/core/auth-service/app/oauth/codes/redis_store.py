@@ -0,0 +1,54 @@
+import json
+import math
+from datetime import datetime
+from typing import Optional
+
+from app.models.oauth import AuthorizationCode
+from .base import CodeStore
+
+KEY_PREFIX = "nucleus:authz_code:"
+
+
+class RedisCodeStore(CodeStore):
+    """
+    Codes in any server speaking the Redis protocol (Redis, Valkey,
+    KeyDB, ...). The server's key TTL handles expiry and GETDEL makes
+    redemption atomic, so replicas can share codes without Postgres.
+    """
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise RuntimeError("CODE_STORE=redis requires the 'redis' package") from e
+            client = redis.from_url(url)
+
+        # Any redis.asyncio-compatible client, e.g. a fakeredis one in tests
+        self._client = client
+
+    async def save(self, auth_code: AuthorizationCode) -> str:
+        ttl_ms = math.ceil((auth_code.expires_at - datetime.now()).total_seconds() * 1000)
+        if ttl_ms <= 0:
+            return auth_code.code
+
+        await self._client.set(
+            KEY_PREFIX + auth_code.code,
+            json.dumps(auth_code.model_dump(mode="json")),
+            px=ttl_ms,
+            nx=True,
+        )
+        return auth_code.code
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        data = await self._client.getdel(KEY_PREFIX + code)
+        if data is None:
+            return None
+
+        auth_code = AuthorizationCode.model_validate(json.loads(data))
+        if auth_code.expires_at <= datetime.now():
+            return None
+        return auth_code
+
+    async def close(self) -> None:
+        await self._client.aclose()
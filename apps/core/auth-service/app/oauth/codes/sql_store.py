@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_async_engine
+from app.models.oauth import AuthorizationCode
+from .base import CodeStore
+
+
+class SQLCodeStore(CodeStore):
+    """Codes in the ``authorization_codes`` table."""
+
+    async def save(self, auth_code: AuthorizationCode) -> str:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            session.add(auth_code)
+            await session.commit()
+        return auth_code.code
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        # Redeem the code in one statement: only one concurrent request can flip
+        # used=false -> true, so redemption is exactly-once without a prior SELECT
+        statement = (
+            update(AuthorizationCode)
+            .where(
+                AuthorizationCode.code == code,
+                AuthorizationCode.used == False,
+                AuthorizationCode.expires_at > datetime.now()
+            )
+            .values(used=True)
+            .returning(AuthorizationCode)
+            .execution_options(synchronize_session=False)
+        )
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            auth_code = (await session.exec(statement)).scalars().first()
+            await session.commit()
+        return auth_code
@@ -0,0 +1,136 @@
+import base64
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.models.oauth import AuthorizationCode
+from .base import CodeStore
+
+# Bound on remembered redemptions; beyond it new codes are refused rather
+# than risking a replay slipping through an evicted entry
+MAX_REDEEMED = 1_000_000
+NONCE_SIZE = 12
+CODE_ID_SIZE = 16
+# Version byte, bound into the ciphertext as associated data
+VERSION = b"\x01"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class ReplayFilter:
+    """
+    Remembers redeemed code IDs until the codes could no longer be valid.
+
+    IDs are kept in buckets by code expiry; a bucket is dropped as a whole
+    once every code in it has expired, so memory stays proportional to the
+    codes redeemed within one code lifetime.
+    """
+
+    def __init__(self, bucket_seconds: float = 30.0, max_entries: int = MAX_REDEEMED):
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+
+        self._buckets: Dict[int, Set[bytes]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        for bucket in [b for b in self._buckets if (b + 1) * self.bucket_seconds <= now]:
+            self._size -= len(self._buckets.pop(bucket))
+
+    def check_and_add(self, code_id: bytes, expires_at: float) -> bool:
+        """Record a redemption; False if the ID was already redeemed or the filter is full"""
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if any(code_id in ids for ids in self._buckets.values()):
+                return False
+            if self._size >= self.max_entries:
+                return False
+            bucket = math.floor(expires_at / self.bucket_seconds)
+            self._buckets.setdefault(bucket, set()).add(code_id)
+            self._size += 1
+            return True
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class StatelessCodeStore(CodeStore):
+    """
+    Self-contained codes: the grant is AES-GCM encrypted into the code
+    itself, so saving and redeeming codes never touch the database. /token
+    still does, to issue the refresh token and load the user's claims.
+
+    The code carries a random ID; single use is enforced by the in-memory
+    ReplayFilter, which only needs to remember IDs for one code lifetime.
+    Like the memory store, that filter is per process, so run one replica
+    or route /token for a client to the same replica.
+    """
+
+    def __init__(self, key: bytes):
+        if len(key) not in (16, 24, 32):
+            raise ValueError("CODE_ENCRYPTION_KEY must decode to 16, 24 or 32 bytes")
+        self._aead = AESGCM(key)
+        self.replay_filter = ReplayFilter()
+
+    async def save(self, auth_code: AuthorizationCode) -> str:
+        code_id = os.urandom(CODE_ID_SIZE)
+        payload = json.dumps({
+            "cid": auth_code.client_id,
+            "uri": auth_code.redirect_uri,
+            "scp": auth_code.scope,
+            "cc": auth_code.code_challenge,
+            "ccm": auth_code.code_challenge_method,
+            "sub": auth_code.user_id,
+            "exp": auth_code.expires_at.timestamp(),
+        }, separators=(",", ":")).encode()
+
+        nonce = os.urandom(NONCE_SIZE)
+        sealed = self._aead.encrypt(nonce, code_id + payload, VERSION)
+        return _b64encode(VERSION + nonce + sealed)
+
+    async def redeem(self, code: str) -> Optional[AuthorizationCode]:
+        try:
+            raw = _b64decode(code)
+        except (ValueError, TypeError):
+            return None
+        if len(raw) <= 1 + NONCE_SIZE or raw[:1] != VERSION:
+            return None
+
+        nonce, sealed = raw[1:1 + NONCE_SIZE], raw[1 + NONCE_SIZE:]
+        try:
+            plaintext = self._aead.decrypt(nonce, sealed, VERSION)
+        except InvalidTag:
+            return None
+
+        code_id, claims = plaintext[:CODE_ID_SIZE], json.loads(plaintext[CODE_ID_SIZE:])
+        if claims["exp"] <= time.time():
+            return None
+        if not self.replay_filter.check_and_add(code_id, claims["exp"]):
+            return None
+
+        return AuthorizationCode(
+            code=code,
+            user_id=claims["sub"],
+            client_id=claims["cid"],
+            redirect_uri=claims["uri"],
+            scope=claims["scp"],
+            code_challenge=claims["cc"],
+            code_challenge_method=claims["ccm"],
+            expires_at=datetime.fromtimestamp(claims["exp"]),
+            used=True,
+        )
@@ -0,0 +1,76 @@
+"""
+JWT encoder for the tokens we sign ourselves.
+
+PyJWT's ``jwt.encode`` is generic: every call rebuilds and re-encodes the
+header, runs the claims through ``json.dumps`` and looks the algorithm up
+again. Our header is constant per key, so its encoded segment is computed
+once per kid and only the claims and signature are produced per token.
+Claims are serialized with orjson and signed with PyJWT's algorithm
+objects. Tokens decode to the same claims as ``jwt.encode``'s, and are
+byte-identical for ASCII claims; orjson writes non-ASCII characters as
+UTF-8 where PyJWT writes ``\\u`` escapes (see tests/test_jwt_encoder.py).
+"""
+import base64
+import threading
+from calendar import timegm
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import orjson
+from jwt.algorithms import get_default_algorithms
+
+from app.oauth.keyring import Key
+
+# Claims PyJWT converts from datetime to a NumericDate
+TIME_CLAIMS = ("exp", "iat", "nbf")
+
+_algorithms = get_default_algorithms()
+
+
+def b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _numeric_dates(claims: dict) -> dict:
+    for claim in TIME_CLAIMS:
+        value = claims.get(claim)
+        if isinstance(value, datetime):
+            claims = {**claims, claim: timegm(value.utctimetuple())}
+    return claims
+
+
+class JWTEncoder:
+    """Signs compact JWS tokens with a cached header segment per key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prepared: Dict[str, Tuple[Key, bytes, object]] = {}
+
+    def _prepare(self, key: Key) -> Tuple[bytes, object]:
+        prepared = self._prepared.get(key.kid)
+        # Compare identity: a reload builds new Key objects, so a replaced key file is picked up
+        if prepared is not None and prepared[0] is key:
+            return prepared[1], prepared[2]
+
+        # Same bytes PyJWT produces: sorted keys, no whitespace
+        header = orjson.dumps({"alg": key.alg, "kid": key.kid, "typ": "JWT"}, option=orjson.OPT_SORT_KEYS)
+        header_segment = b64url(header) + b"."
+        with self._lock:
+            self._prepared[key.kid] = (key, header_segment, _algorithms[key.alg])
+        return header_segment, _algorithms[key.alg]
+
+    def encode_many(self, key: Key, claims_list: List[dict]) -> List[str]:
+        """Sign several claim sets with one key lookup and header preparation"""
+        header_segment, algorithm = self._prepare(key)
+        tokens = []
+        for claims in claims_list:
+            signing_input = header_segment + b64url(orjson.dumps(_numeric_dates(claims)))
+            signature = algorithm.sign(signing_input, key.private_key)
+            tokens.append((signing_input + b"." + b64url(signature)).decode("ascii"))
+        return tokens
+
+    def encode(self, key: Key, claims: dict) -> str:
+        return self.encode_many(key, [claims])[0]
+
+
+encoder = JWTEncoder()
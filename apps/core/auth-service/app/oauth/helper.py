@@ -1,33 +1,43 @@
 import hashlib
 import base64
-from cryptography.hazmat.primitives import serialization
-import jwt
+from typing import List
 from datetime import datetime, timedelta
 from app.config.settings import Settings
+from app.metrics import stage_timer
+from app.oauth.encoder import encoder
+from app.oauth.keyring import keyring
 
 settings = Settings()
 
+ACCESS_TOKEN_LIFETIME = timedelta(minutes=15)
+
 def verify_pkce(code_verifier: str, code_challenge: str) -> bool:
     digest = hashlib.sha256(code_verifier.encode()).digest()
     computed = base64.urlsafe_b64encode(digest).decode().rstrip("=")
     return computed == code_challenge
 
 
-def load_private_key():
-    """Load the private key from the file system."""
-    with open("app/keys/private.pem", "rb") as f:
-        return serialization.load_pem_private_key(
-            f.read(),
-            password=None
-        )
+def sign_jwt(claims: dict) -> str:
+    key = keyring.signing_key()
+
+    with stage_timer("jwt_sign"):
+        return encoder.encode(key, claims)
+
+
+def sign_jwts(claims_list: List[dict]) -> List[str]:
+    """Sign several tokens with the same key, e.g. the access and id token of one grant"""
+    key = keyring.signing_key()
 
+    with stage_timer("jwt_sign"):
+        return encoder.encode_many(key, claims_list)
 
-def sign_jwt(claims: dict):
-    private_key = load_private_key()
 
-    return jwt.encode(
-        claims,
-        private_key,
-        algorithm="RS256",
-        headers={"kid": settings.KID},
-    )
+def access_token_claims(user_id: str, audience: str, scope: str) -> dict:
+    """Claims for an access token issued now"""
+    return {
+        "iss": settings.ISSUER,
+        "sub": user_id,
+        "aud": audience,
+        "scope": scope,
+        "exp": datetime.now() + ACCESS_TOKEN_LIFETIME
+    }
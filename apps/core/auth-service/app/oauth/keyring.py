@@ -0,0 +1,305 @@
+"""
+In-memory key ring for token signing keys.
+
+Keys are read from ``KEYS_DIR`` once and kept as parsed key objects,
+keyed by ``kid``. The directory layout is:
+
+- ``private.pem`` / ``public.pem``: the original key pair, published as ``settings.KID``
+- ``<kid>.private.pem``: an additional signing key
+- ``<kid>.public.pem``: a verification-only key (e.g. a retired signing key)
+
+The newest private key (by mtime) signs new tokens unless ``SIGNING_KID``
+pins one. Rotating keys means dropping new files into the directory; the
+ring picks them up on the next mtime check or on an explicit ``reload()``.
+A new private key is published in the JWKS straight away but only starts
+signing once it is ``prepublish_seconds`` old, so relying parties that
+cached the previous JWKS have refetched it by the time they see its kid.
+
+Each key's JWS algorithm follows from its type: RSA keys sign RS256, P-256
+keys ES256 and Ed25519 keys EdDSA, so keys of different types can sit in
+the ring together during a rotation.
+"""
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.config.settings import Settings
+
+settings = Settings()
+
+PRIVATE_SUFFIX = ".private.pem"
+PUBLIC_SUFFIX = ".public.pem"
+
+SUPPORTED_ALGORITHMS = ["RS256", "ES256", "EdDSA"]
+
+
+def algorithm_for(public_key) -> str:
+    """The JWS algorithm a key signs with, derived from its type"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(public_key.curve, ec.SECP256R1):
+        return "ES256"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported key type {type(public_key).__name__}; use RSA, EC P-256 or Ed25519")
+
+
+@dataclass(frozen=True)
+class Key:
+    kid: str
+    public_key: Any
+    private_key: Optional[Any] = None
+    mtime: float = 0.0
+    alg: str = "RS256"
+
+    @property
+    def can_sign(self) -> bool:
+        return self.private_key is not None
+
+
+def _kid_for(name: str) -> Optional[Tuple[str, bool]]:
+    """Map a file name to ``(kid, is_private)``, or None if it is not a key file."""
+    if name == "private.pem":
+        return settings.KID, True
+    if name == "public.pem":
+        return settings.KID, False
+    if name.endswith(PRIVATE_SUFFIX):
+        return name[: -len(PRIVATE_SUFFIX)], True
+    if name.endswith(PUBLIC_SUFFIX):
+        return name[: -len(PUBLIC_SUFFIX)], False
+    return None
+
+
+def _load_pem(path: Path, private: bool):
+    data = path.read_bytes()
+    if private:
+        return serialization.load_pem_private_key(data, password=None)
+    return serialization.load_pem_public_key(data)
+
+
+def generate_key(keys_dir: str, kid: str, alg: str) -> Path:
+    """Write a new ``<kid>.private.pem`` for alg; it signs once its pre-publish window has passed"""
+    if alg == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif alg == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif alg == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f"Unsupported algorithm {alg}; use one of {', '.join(SUPPORTED_ALGORITHMS)}")
+
+    path = Path(keys_dir) / f"{kid}{PRIVATE_SUFFIX}"
+    if path.exists():
+        raise FileExistsError(f"{path} already exists")
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    # Write then rename, so a reload never sees a half-written key
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(pem)
+    os.chmod(tmp, 0o600)
+    os.replace(tmp, path)
+    return path
+
+
+class KeyRing:
+    """Parsed signing and verification keys, reloaded when the key files change."""
+
+    def __init__(
+        self,
+        keys_dir: str,
+        signing_kid: Optional[str] = None,
+        check_interval: float = 5.0,
+        prepublish_seconds: float = 0.0,
+    ):
+        self.keys_dir = Path(keys_dir)
+        self.signing_kid = signing_kid
+        self.check_interval = check_interval
+        self.prepublish_seconds = prepublish_seconds
+
+        self._lock = threading.Lock()
+        self._keys: Dict[str, Key] = {}
+        self._active: Optional[Key] = None
+        self._fingerprint: Tuple = ()
+        self._next_check = 0.0
+        self._promote_at = math.inf
+        self._listeners: List[Callable[["KeyRing"], None]] = []
+        self.version = 0
+        self.reload_failures = 0
+        self.last_error: Optional[str] = None
+
+    def _scan(self) -> Tuple:
+        """Cheap fingerprint of the key directory: names, sizes and mtimes."""
+        entries = []
+        with os.scandir(self.keys_dir) as it:
+            for entry in it:
+                if _kid_for(entry.name) is None:
+                    continue
+                st = entry.stat()
+                entries.append((entry.name, st.st_size, st.st_mtime_ns))
+        return tuple(sorted(entries))
+
+    def _build(self) -> Dict[str, Key]:
+        private: Dict[str, Tuple[Any, float]] = {}
+        public: Dict[str, Any] = {}
+
+        for path in self.keys_dir.iterdir():
+            mapped = _kid_for(path.name)
+            if mapped is None:
+                continue
+            kid, is_private = mapped
+            try:
+                key = _load_pem(path, is_private)
+            except ValueError as e:
+                raise ValueError(f"Cannot load {path.name}: {e}") from e
+            if is_private:
+                private[kid] = (key, path.stat().st_mtime)
+            else:
+                public[kid] = key
+
+        keys: Dict[str, Key] = {}
+        for kid, (private_key, mtime) in private.items():
+            public_key = private_key.public_key()
+            keys[kid] = Key(kid=kid, public_key=public_key, private_key=private_key, mtime=mtime, alg=algorithm_for(public_key))
+        for kid, public_key in public.items():
+            if kid not in keys:
+                keys[kid] = Key(kid=kid, public_key=public_key, alg=algorithm_for(public_key))
+
+        return keys
+
+    def _select_active(self, keys: Dict[str, Key], now: float) -> Tuple[Key, float]:
+        """The signing key, and the wall-clock time a newer key takes over (inf if none)"""
+        signers = [k for k in keys.values() if k.can_sign]
+        if not signers:
+            raise RuntimeError(f"No private signing key found in {self.keys_dir}")
+
+        if self.signing_kid:
+            if self.signing_kid not in keys or not keys[self.signing_kid].can_sign:
+                raise RuntimeError(f"Signing key {self.signing_kid!r} not found in {self.keys_dir}")
+            return keys[self.signing_kid], math.inf
+
+        published = [k for k in signers if k.mtime + self.prepublish_seconds <= now]
+        if published:
+            active = max(published, key=lambda k: (k.mtime, k.kid))
+        else:
+            # Nothing has been published long enough (e.g. a fresh deploy);
+            # the oldest key is the one relying parties most likely have
+            active = min(signers, key=lambda k: (k.mtime, k.kid))
+
+        pending = [k.mtime + self.prepublish_seconds for k in signers if k.mtime > active.mtime]
+        return active, min(pending, default=math.inf)
+
+    def reload(self) -> bool:
+        """
+        Re-read the key directory now. Returns True if the key set or the
+        signing key changed. On a parse error the previous keys stay in
+        service, and the error is reported and raised.
+        """
+        try:
+            changed = self._reload()
+        except Exception as e:
+            self._report_failure(e)
+            raise
+        self.last_error = None
+        return changed
+
+    def _report_failure(self, error: Exception) -> None:
+        """Count and log a failed reload; exported through stats() and /metrics"""
+        self.reload_failures += 1
+        self.last_error = str(error)
+        print(f"Key reload failed, keeping current keys: {error}")
+
+    def _reload(self) -> bool:
+        with self._lock:
+            fingerprint = self._scan()
+            self._next_check = time.monotonic() + self.check_interval
+            now = time.time()
+            if fingerprint == self._fingerprint and self._active is not None:
+                if now < self._promote_at:
+                    return False
+                # Same files, but a pre-published key is now old enough to sign
+                keys = self._keys
+            else:
+                keys = self._build()
+
+            active, promote_at = self._select_active(keys, now)
+            self._keys, self._active, self._promote_at = keys, active, promote_at
+            self._fingerprint = fingerprint
+            self.version += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(self)
+        return True
+
+    def load(self) -> None:
+        """Load keys if they have not been loaded yet."""
+        if self._active is None:
+            self.reload()
+
+    def maybe_reload(self) -> None:
+        """Reload if the check interval has elapsed and the key files changed on disk."""
+        if self._active is None:
+            self.reload()
+            return
+        if time.monotonic() < self._next_check:
+            return
+        try:
+            self.reload()
+        except Exception:
+            # Already reported; keep signing with the keys we have, a
+            # half-written file is retried on the next check
+            pass
+
+    def on_reload(self, listener: Callable[["KeyRing"], None]) -> None:
+        """Register a callback invoked after the key set changes."""
+        self._listeners.append(listener)
+
+    def signing_key(self) -> Key:
+        """Get the key used to sign new tokens"""
+        self.maybe_reload()
+        return self._active  # ty:ignore[invalid-return-type]
+
+    def get(self, kid: str) -> Optional[Key]:
+        """Get a key by kid"""
+        self.maybe_reload()
+        return self._keys.get(kid)
+
+    def keys(self) -> List[Key]:
+        """All active keys, signing and verification-only"""
+        self.maybe_reload()
+        return list(self._keys.values())
+
+    def stats(self) -> dict:
+        return {
+            "active_kid": self._active.kid if self._active else None,
+            "kids": sorted(self._keys),
+            "version": self.version,
+            "reload_failures": self.reload_failures,
+            "last_error": self.last_error,
+        }
+
+
+def default_prepublish_seconds() -> float:
+    """Long enough for a JWKS cached just before the key appeared to expire"""
+    if settings.KEY_PREPUBLISH_SECONDS is not None:
+        return settings.KEY_PREPUBLISH_SECONDS
+    return settings.JWKS_MAX_AGE + settings.KEY_RELOAD_INTERVAL
+
+
+keyring = KeyRing(
+    settings.KEYS_DIR,
+    signing_kid=settings.SIGNING_KID,
+    check_interval=settings.KEY_RELOAD_INTERVAL,
+    prepublish_seconds=default_prepublish_seconds(),
+)
@@ -0,0 +1,112 @@
+"""
+Rotating refresh tokens.
+
+Every grant starts a family. Redeeming a refresh token marks it used and
+issues its successor in the same family, in one transaction. A used token
+presented again means it leaked (or the client replayed it), so the whole
+family is revoked and the legitimate holder has to log in again.
+
+Only the sha256 of a token is stored; tokens are 256 random bits, so a fast
+hash is enough and a lookup is a single indexed equality match.
+"""
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config.settings import Settings
+from app.database import get_async_engine
+from app.models.oauth import RefreshToken
+
+settings = Settings()
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _new_token(user_id: str, client_id: str, scope: str, family_id: str) -> Tuple[str, RefreshToken]:
+    token = secrets.token_urlsafe(32)
+    row = RefreshToken(
+        token_hash=hash_refresh_token(token),
+        family_id=family_id,
+        user_id=user_id,
+        client_id=client_id,
+        scope=scope,
+        expires_at=datetime.now() + timedelta(seconds=settings.REFRESH_TOKEN_TTL),
+    )
+    return token, row
+
+
+async def issue_refresh_token(user_id: str, client_id: str, scope: str) -> str:
+    """Start a new family and return its first token"""
+    token, row = _new_token(user_id, client_id, scope, uuid.uuid4().hex)
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        session.add(row)
+        await session.commit()
+    return token
+
+
+async def rotate_refresh_token(token: str, client_id: str) -> Optional[Tuple[str, RefreshToken]]:
+    """
+    Spend a refresh token and issue its successor.
+    Returns (new token, spent row), or None if the token is not redeemable.
+    """
+    token_hash = hash_refresh_token(token)
+    now = datetime.now()
+
+    # Same pattern as code redemption: only one request can flip used=false -> true
+    statement = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used == False,
+            RefreshToken.revoked == False,
+            RefreshToken.expires_at > now
+        )
+        .values(used=True)
+        .returning(RefreshToken)
+        .execution_options(synchronize_session=False)
+    )
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        spent = (await session.exec(statement)).scalars().first()
+
+        if spent is None:
+            # Only the failure path pays for a second lookup, to tell reuse from garbage
+            reused = (await session.exec(
+                select(RefreshToken.family_id).where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.used == True
+                )
+            )).first()
+            if reused is not None:
+                await _revoke_family(session, reused)
+                print(f"Refresh token reuse detected, revoked family {reused}")
+            await session.commit()
+            return None
+
+        if spent.client_id != client_id:
+            await _revoke_family(session, spent.family_id)
+            await session.commit()
+            return None
+
+        new_token, row = _new_token(spent.user_id, spent.client_id, spent.scope, spent.family_id)
+        session.add(row)
+        await session.commit()
+
+    return new_token, spent
+
+
+async def _revoke_family(session: AsyncSession, family_id: str) -> None:
+    await session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id)
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+
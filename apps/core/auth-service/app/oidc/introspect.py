@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Form, HTTPException
+from app.config.settings import Settings
+from app.oidc.verify import verify_access_token_async, verify_tokens_async
+from app.schemas.introspect import BatchIntrospectRequest, BatchIntrospectResponse, TokenStatus
+from app.security.clients import require_introspection_client
+
+router = APIRouter()
+
+settings = Settings()
+
+@router.post("/introspect", dependencies=[Depends(require_introspection_client)])
+async def introspect(
+    token: str = Form(...),
+    token_type_hint: str = Form(None),
+):
+    """Token introspection (RFC 7662); callers authenticate with INTROSPECT_CLIENTS"""
+    try:
+        claims = await verify_access_token_async(token)
+    except Exception:
+        return {"active": False}
+
+    return {
+        "active": True,
+        "token_type": "Bearer",
+        "iss": claims.get("iss"),
+        "sub": claims.get("sub"),
+        "aud": claims.get("aud"),
+        "client_id": claims.get("aud"),
+        "scope": claims.get("scope"),
+        "exp": claims.get("exp"),
+    }
+
+@router.post("/introspect/batch", response_model=BatchIntrospectResponse, dependencies=[Depends(require_introspection_client)])
+async def introspect_batch(payload: BatchIntrospectRequest):
+    """Validate many access tokens in one call; results are in request order"""
+    if len(payload.tokens) > settings.INTROSPECT_MAX_BATCH:
+        raise HTTPException(status_code=413, detail="too_many_tokens")
+
+    results = await verify_tokens_async(payload.tokens)
+
+    return BatchIntrospectResponse(results=[
+        TokenStatus(valid=True, sub=claims.get("sub"), scope=claims.get("scope"), exp=claims.get("exp"))
+        if claims is not None else TokenStatus(valid=False)
+        for claims in results
+    ])
@@ -0,0 +1,195 @@
+"""
+User profile claims for /userinfo and the id_token, read from the users table.
+
+``UserClaimsService`` keeps a bounded LRU of profiles by ``sub`` with a TTL.
+Concurrent misses for one ``sub`` share a single query, and a committed
+update or delete of a ``User`` drops its entry in this process (other
+replicas see the change once their entry's TTL runs out).
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config.settings import Settings
+from app.database import get_async_engine
+from app.models.user import User
+
+settings = Settings()
+
+# Which profile claims each scope releases
+SCOPE_CLAIMS = {
+    "email": ("email", "email_verified"),
+}
+
+
+def filter_claims(profile: dict, scopes: Iterable[str]) -> dict:
+    """The sub plus the claims the granted scopes allow"""
+    claims = {"sub": profile["sub"]}
+    for scope in scopes:
+        for claim in SCOPE_CLAIMS.get(scope, ()):
+            if claim in profile:
+                claims[claim] = profile[claim]
+    return claims
+
+
+async def load_profile(sub: str) -> Optional[dict]:
+    try:
+        user_id = uuid.UUID(sub)
+    except ValueError:
+        return None
+
+    async with AsyncSession(get_async_engine()) as session:
+        row = (await session.exec(
+            select(User.email, User.email_verified).where(User.id == user_id)
+        )).first()
+
+    if row is None:
+        return None
+    return {"sub": sub, "email": row[0], "email_verified": row[1]}
+
+
+class UserClaimsService:
+    """LRU + TTL cache of user profiles with single-flight loading."""
+
+    def __init__(self, max_size: int, ttl: float, loader=load_profile):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.loader = loader
+
+        # Unknown subs are cached as None too, so bogus subs do not hit the DB every time
+        self._entries: "OrderedDict[str, Tuple[float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _cached(self, sub: str) -> Tuple[bool, Optional[dict]]:
+        with self._lock:
+            entry = self._entries.get(sub)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, profile = entry
+            if expires_at <= time.monotonic():
+                del self._entries[sub]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(sub)
+            self.hits += 1
+            return True, profile
+
+    def _store(self, sub: str, profile: Optional[dict], generation: int) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            # An invalidation during the load means the row may have changed under us
+            if generation != self._generation:
+                return
+            self._entries[sub] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(sub)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def _load(self, sub: str) -> Optional[dict]:
+        generation = self._generation
+        try:
+            self.loads += 1
+            profile = await self.loader(sub)
+            self._store(sub, profile, generation)
+            return profile
+        finally:
+            del self._in_flight[sub]
+
+    async def get_profile(self, sub: str) -> Optional[dict]:
+        """Full profile for sub, or None if there is no such user"""
+        found, profile = self._cached(sub)
+        if found:
+            return profile
+
+        # The load runs as its own task, so a cancelled caller does not fail the others
+        task = self._in_flight.get(sub)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._load(sub))
+            self._in_flight[sub] = task
+        return await asyncio.shield(task)
+
+    async def get_claims(self, sub: str, scopes: Iterable[str]) -> Optional[dict]:
+        """Scope-filtered claims for sub, or None if there is no such user"""
+        profile = await self.get_profile(sub)
+        if profile is None:
+            return None
+        return filter_claims(profile, scopes)
+
+    def invalidate(self, sub: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            self._entries.pop(sub, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "in_flight": len(self._in_flight),
+        }
+
+
+user_claims = UserClaimsService(
+    max_size=settings.USER_CLAIMS_CACHE_SIZE,
+    ttl=settings.USER_CLAIMS_CACHE_TTL,
+)
+
+
+# Invalidate after commit rather than at flush, so a concurrent load cannot
+# re-cache the old row between the UPDATE and the COMMIT. Bulk UPDATE/DELETE
+# statements bypass these ORM events; go through the ORM for profile changes.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target: User) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_users", set()).add(str(target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for sub in session.info.pop("changed_users", ()):
+        user_claims.invalidate(sub)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_users", None)
@@ -1,32 +1,26 @@
 from fastapi import APIRouter, Header, HTTPException
-from app.oidc.verify import verify_access_token
+from app.oidc.user_claims import user_claims
+from app.oidc.verify import verify_access_token_async
 
 router = APIRouter()
 
 @router.get("/userinfo")
-def userinfo(authorization: str = Header(...)):
+async def userinfo(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="invalid_authorization_header")
 
     token = authorization.split(" ")[1]
 
     try:
-        claims = verify_access_token(token)
+        claims = await verify_access_token_async(token)
     except Exception:
         raise HTTPException(status_code=401, detail="invalid_token")
 
-    scope = claims.get("scope", "")
-    scopes = scope.split()
+    scopes = claims.get("scope", "").split()
 
-    response = {
-        "sub": claims["sub"]
-    }
-
-    if "email" in scopes:
-        response["email"] = "dev@nucleus.local"
-        response["email_verified"] = True
-
-    if "profile" in scopes:
-        response["name"] = "Dev User"
+    response = await user_claims.get_claims(claims["sub"], scopes)
+    if response is None:
+        # Token is valid but the user no longer exists
+        raise HTTPException(status_code=401, detail="invalid_token")
 
     return response
@@ -1,23 +1,212 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
 import jwt
-from jwt import PyJWKClient
+from starlette.concurrency import run_in_threadpool
 from app.config.settings import Settings
+from app.metrics import stage_timer
+from app.oauth.keyring import Key, KeyRing, keyring
+from app.oidc.claims_cache import ClaimsCache
 
 settings = Settings()
 
-jwk_client = PyJWKClient(f"{settings.JWKS_URL}")
+# Cap on remembered bogus kids so a flood of random kids cannot grow memory
+MAX_NEGATIVE_ENTRIES = 1024
+
+
+class LocalKeyResolver:
+    """
+    Resolves a token's kid to a public key from the in-process key ring,
+    without fetching our own JWKS over HTTP.
+
+    The kid -> key map is refreshed every ``ttl`` seconds, and replaced as
+    soon as the ring reloads, so a key removed from the ring stops
+    verifying straight away. An unknown kid triggers one forced refresh
+    (concurrent callers wait on the same one), and kids still unknown
+    afterwards are rejected for ``negative_ttl`` seconds without touching
+    the key ring again.
+    """
+
+    def __init__(self, ring: KeyRing, ttl: float, negative_ttl: float):
+        self.ring = ring
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._keys: Dict[str, Key] = {}
+        self._expires_at = 0.0
+        self._generation = 0
+        self._unknown: Dict[str, float] = {}
+        self._refresh_lock = threading.Lock()
+
+    def _snapshot(self, force: bool) -> None:
+        if force:
+            try:
+                self.ring.reload()
+            except Exception:
+                # Reported by the ring; a bad key file must not fail
+                # verification, the kid just stays unknown
+                pass
+        self._keys = {key.kid: key for key in self.ring.keys()}
+        self._expires_at = time.monotonic() + self.ttl
+        self._generation += 1
+
+    def on_key_change(self, ring: KeyRing) -> bool:
+        """
+        Key ring listener: take the new key set now rather than after ttl.
+        Returns True if any kid was removed.
+        """
+        keys = {key.kid: key for key in ring.keys()}
+        removed = bool(self._keys.keys() - keys.keys())
+        # Plain assignments, no lock: this can run inside _snapshot's ring.reload()
+        self._keys = keys
+        self._expires_at = time.monotonic() + self.ttl
+        self._generation += 1
+        self._unknown = {}
+        return removed
+
+    def _remember_unknown(self, kid: str, now: float) -> None:
+        if len(self._unknown) >= MAX_NEGATIVE_ENTRIES:
+            self._unknown = {k: until for k, until in self._unknown.items() if until > now}
+            if len(self._unknown) >= MAX_NEGATIVE_ENTRIES:
+                self._unknown.clear()
+        self._unknown[kid] = now + self.negative_ttl
+
+    def get(self, kid: str):
+        now = time.monotonic()
+        if now >= self._expires_at:
+            with self._refresh_lock:
+                if now >= self._expires_at:
+                    self._snapshot(force=False)
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        if self._unknown.get(kid, 0.0) > now:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+
+        # Single flight: only refresh if no one else refreshed while we waited
+        generation = self._generation
+        with self._refresh_lock:
+            if self._generation == generation:
+                self._snapshot(force=True)
+
+        key = self._keys.get(kid)
+        if key is None:
+            self._remember_unknown(kid, now)
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+
+key_resolver = LocalKeyResolver(
+    keyring,
+    ttl=settings.VERIFY_KEYS_TTL,
+    negative_ttl=settings.UNKNOWN_KID_TTL,
+)
+
+claims_cache = ClaimsCache(
+    max_size=settings.CLAIMS_CACHE_SIZE,
+    ttl=settings.CLAIMS_CACHE_TTL,
+)
+
+def _on_key_change(ring: KeyRing) -> None:
+    if key_resolver.on_key_change(ring):
+        # Cached claims may come from a token signed by the removed key
+        claims_cache.clear()
+
+keyring.on_reload(_on_key_change)
+
+def _poll_keys() -> None:
+    # Cheap unless KEY_RELOAD_INTERVAL has passed; runs before the claims
+    # cache lookup so a removed key also evicts the claims it vouched for
+    keyring.maybe_reload()
+
+def _decode(token: str, signing_key: Key) -> dict:
+    # Only the key's own algorithm is accepted, so a token cannot pick a weaker one
+    with stage_timer("jwt_verify"):
+        claims = jwt.decode(
+            token,
+            signing_key.public_key,
+            algorithms=[signing_key.alg],
+            audience=None,
+            issuer=settings.ISSUER,
+            options={
+                "verify_aud": False
+            }
+        )
+
+    claims_cache.put(token, claims)
+    return dict(claims)
+
+def _token_kid(token: str) -> str:
+    kid = jwt.get_unverified_header(token).get("kid")
+    if not kid:
+        raise jwt.InvalidTokenError("Token has no kid")
+    return kid
+
+def _verify_signed_token(token: str) -> dict:
+    return _decode(token, key_resolver.get(_token_kid(token)))
+
+def _verify_signed_tokens(tokens: List[str]) -> Dict[str, Optional[dict]]:
+    """Verify distinct uncached tokens, resolving each kid's key once"""
+    results: Dict[str, Optional[dict]] = {}
+    by_kid: Dict[str, List[str]] = defaultdict(list)
+    for token in tokens:
+        try:
+            by_kid[_token_kid(token)].append(token)
+        except jwt.PyJWTError:
+            results[token] = None
+
+    for kid, group in by_kid.items():
+        try:
+            signing_key = key_resolver.get(kid)
+        except jwt.PyJWTError:
+            results.update(dict.fromkeys(group))
+            continue
+        for token in group:
+            try:
+                results[token] = _decode(token, signing_key)
+            except jwt.PyJWTError:
+                results[token] = None
+
+    return results
 
 def verify_access_token(token: str) -> dict:
-    signing_key = jwk_client.get_signing_key_from_jwt(token)
-
-    claims = jwt.decode(
-        token,
-        signing_key.key,
-        algorithms=["RS256"],
-        audience=None,
-        issuer=settings.ISSUER,
-        options={
-            "verify_aud": False
-        }
-    )
-
-    return claims
+    _poll_keys()
+    cached = claims_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+
+    return _verify_signed_token(token)
+
+async def verify_access_token_async(token: str) -> dict:
+    """Verify from the claims cache inline, offloading only a full signature verify"""
+    _poll_keys()
+    cached = claims_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+
+    return await run_in_threadpool(_verify_signed_token, token)
+
+async def verify_tokens_async(tokens: List[str]) -> List[Optional[dict]]:
+    """
+    Verify a batch of tokens, returning claims (or None if invalid) in input order.
+    Repeats are verified once, cache hits are served inline and the misses
+    are verified together in a single threadpool hop.
+    """
+    _poll_keys()
+    verified: Dict[str, Optional[dict]] = {}
+    misses = []
+    for token in dict.fromkeys(tokens):
+        cached = claims_cache.get(token)
+        if cached is not None:
+            verified[token] = dict(cached)
+        else:
+            misses.append(token)
+
+    if misses:
+        verified.update(await run_in_threadpool(_verify_signed_tokens, misses))
+
+    return [verified[token] for token in tokens]
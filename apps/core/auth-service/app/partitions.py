@@ -0,0 +1,138 @@
+"""
+Hourly partition maintenance for a partitioned authorization_codes table.
+
+When the table is range-partitioned by expires_at (migration
+42162340926e), expiry is a partition drop: the reaper pre-creates the
+next hours' partitions and drops every partition whose whole range has
+expired, instead of deleting rows one chunk at a time.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from .database import get_engine
+
+TABLE = "authorization_codes"
+PARTITION_PREFIX = f"{TABLE}_p"
+DEFAULT_PARTITION = f"{TABLE}_default"
+NAME_FORMAT = "%Y%m%d%H"
+
+_partitioned: Optional[bool] = None
+
+
+def partition_name(hour: datetime) -> str:
+    return PARTITION_PREFIX + hour.strftime(NAME_FORMAT)
+
+
+def partition_start(name: str) -> Optional[datetime]:
+    """Range start encoded in a partition name, or None for other tables"""
+    if not name.startswith(PARTITION_PREFIX):
+        return None
+    try:
+        return datetime.strptime(name[len(PARTITION_PREFIX):], NAME_FORMAT)
+    except ValueError:
+        return None
+
+
+def is_partition(name: str) -> bool:
+    """Whether a table is one of the authorization_codes partitions"""
+    return name == DEFAULT_PARTITION or partition_start(name) is not None
+
+
+def database_now(connection: Connection) -> datetime:
+    """The database's local time, the same clock migration 42162340926e used for its partitions"""
+    return connection.execute(text("SELECT localtimestamp")).scalar_one()
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ).bindparams(table=TABLE)).scalar())
+
+
+def list_partitions(connection: Connection) -> List[str]:
+    return list(connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = to_regclass(:table)
+        ORDER BY child.relname
+    """).bindparams(table=TABLE)).scalars())
+
+
+def ensure_partitions(connection: Connection, hours_ahead: int, now: datetime) -> List[str]:
+    """Create hourly partitions from the current hour through hours_ahead"""
+    existing = set(list_partitions(connection))
+    connection.commit()
+    current = now.replace(minute=0, second=0, microsecond=0)
+    created = []
+
+    for i in range(hours_ahead + 1):
+        start = current + timedelta(hours=i)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        try:
+            with connection.begin():
+                connection.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {TABLE} '
+                    f"FOR VALUES FROM ('{start.isoformat(sep=' ')}') TO ('{(start + timedelta(hours=1)).isoformat(sep=' ')}')"
+                ))
+            created.append(name)
+        except DBAPIError as e:
+            # Usually rows for this hour already sit in the default partition;
+            # they are reaped by the chunked DELETE and creation is retried next run
+            print(f"Could not create partition {name}: {e.orig}")
+
+    return created
+
+
+def drop_expired_partitions(connection: Connection, now: datetime, lock_timeout_ms: int = 1000) -> List[str]:
+    """Drop hourly partitions whose whole range is before now"""
+    dropped = []
+    partitions = list_partitions(connection)
+    connection.commit()
+
+    for name in partitions:
+        start = partition_start(name)
+        if start is None or start + timedelta(hours=1) > now:
+            continue
+        try:
+            with connection.begin():
+                # Dropping a partition briefly locks the parent; give up rather than queue behind traffic
+                connection.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+                connection.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            dropped.append(name)
+        except DBAPIError as e:
+            print(f"Could not drop partition {name}: {e.orig}")
+
+    return dropped
+
+
+def maintain_partitions(hours_ahead: int) -> Optional[dict]:
+    """
+    Pre-create upcoming partitions and drop expired ones.
+    Returns None when authorization_codes is not partitioned.
+    """
+    global _partitioned
+    engine = get_engine()
+
+    with engine.connect() as connection:
+        if _partitioned is None:
+            _partitioned = is_partitioned(connection)
+            connection.commit()
+        if not _partitioned:
+            return None
+
+        # Partition bounds follow the database clock, not this host's
+        now = database_now(connection)
+        connection.commit()
+        return {
+            "created": ensure_partitions(connection, hours_ahead, now),
+            "dropped": drop_expired_partitions(connection, now),
+        }
@@ -0,0 +1,89 @@
+"""
+Connection pools that count checkouts, overflow and waits for /admin/db-pool.
+"""
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def record(self, overflow: bool, waited: bool, elapsed: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                if overflow:
+                    self.overflow_checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_seconds += elapsed
+                self.max_wait_seconds = max(self.max_wait_seconds, elapsed)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "waits": self.waits,
+                "wait_seconds_total": round(self.wait_seconds, 4),
+                "max_wait_seconds": round(self.max_wait_seconds, 4),
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records whether each checkout had to wait for a connection."""
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        # A checkout waits when every pooled and overflow connection is in use
+        waited = self.checkedout() >= self.size() + self.max_overflow
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.record(
+                overflow=self.overflow() > 0,
+                waited=waited,
+                elapsed=time.perf_counter() - started,
+                timed_out=timed_out,
+            )
+
+    def metrics(self) -> dict:
+        return {
+            "size": self.size(),
+            "max_overflow": self.max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(0, self.overflow()),
+            **self.stats.to_dict(),
+        }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Async-adapted variant for the asyncpg engine."""
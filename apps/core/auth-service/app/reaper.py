@@ -0,0 +1,96 @@
+"""
+Background task that deletes expired authorization codes and refresh tokens.
+"""
+import asyncio
+import random
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from .db_utils import cleanup_expired_codes, cleanup_expired_refresh_tokens
+from .partitions import maintain_partitions
+
+
+class Reaper:
+    """
+    Every interval (plus jitter) until stopped: maintains hourly partitions
+    when authorization_codes is partitioned, then runs cleanup_expired_codes
+    for whatever is left (the default partition, or the whole table when
+    it is not partitioned). Expired refresh tokens are deleted the same way.
+    With reap_codes off (codes are not in SQL) only refresh tokens are reaped.
+    """
+
+    def __init__(self, interval: float, chunk_size: int, jitter: float, partition_hours_ahead: int = 24, reap_codes: bool = True):
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.jitter = jitter
+        self.partition_hours_ahead = partition_hours_ahead
+        self.reap_codes = reap_codes
+
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.total_deleted = 0
+        self.last_result: Optional[dict] = None
+
+    async def run_once(self) -> dict:
+        result = {"deleted": 0, "chunks": 0, "partitions": None}
+        if self.reap_codes:
+            partitions = await run_in_threadpool(maintain_partitions, self.partition_hours_ahead)
+            if partitions and (partitions["created"] or partitions["dropped"]):
+                print(f"Reaper created partitions {partitions['created']}, dropped {partitions['dropped']}")
+
+            # The deletes use the sync engine, same as manage.py and /admin/cleanup
+            result = await run_in_threadpool(cleanup_expired_codes, self.chunk_size)
+            result["partitions"] = partitions
+
+        refresh = await run_in_threadpool(cleanup_expired_refresh_tokens, self.chunk_size)
+        result["refresh_tokens"] = refresh
+
+        self.runs += 1
+        self.total_deleted += result["deleted"] + refresh["deleted"]
+        self.last_result = result
+        if result["deleted"]:
+            print(
+                f"Reaper deleted {result['deleted']} expired codes in {result['chunks']} chunks "
+                f"({result['rows_per_sec']} rows/sec)"
+            )
+        if refresh["deleted"]:
+            print(f"Reaper deleted {refresh['deleted']} expired refresh tokens")
+        return result
+
+    async def _loop(self) -> None:
+        while True:
+            # Jitter keeps replicas from reaping in lockstep
+            await asyncio.sleep(self.interval + random.uniform(0, self.jitter))
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                print(f"Reaper run failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval_seconds": self.interval,
+            "chunk_size": self.chunk_size,
+            "runs": self.runs,
+            "failures": self.failures,
+            "total_deleted": self.total_deleted,
+            "last_run": self.last_result,
+        }
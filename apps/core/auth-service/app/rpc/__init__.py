@@ -0,0 +1,3 @@
+from .server import AuthService, start_grpc_server
+
+__all__ = ["AuthService", "start_grpc_server"]
@@ -0,0 +1,32 @@
+"""
+Run the gRPC server on its own, without the HTTP app:
+
+    python -m app.rpc
+"""
+import asyncio
+
+from app.config.settings import Settings
+from app.database import init_db, close_db
+from app.oauth.keyring import keyring
+from app.security.password import hashing_executor
+
+from .server import start_grpc_server
+
+settings = Settings()
+
+
+async def main():
+    init_db()
+    keyring.load()
+    server = await start_grpc_server(settings.GRPC_PORT, settings.GRPC_MAX_CONCURRENT_RPCS)
+    print(f"gRPC server listening on port {settings.GRPC_PORT} (active kid: {keyring.signing_key().kid})")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(grace=5)
+        await close_db()
+        hashing_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
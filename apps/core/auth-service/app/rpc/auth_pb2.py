@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: auth.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'auth.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nauth.proto\x12\x07\x61uth.v1\"0\n\rSignupRequest\x12\r\n\x05\x65mail\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"/\n\x0cLoginRequest\x12\r\n\x05\x65mail\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\'\n\x0eRefreshRequest\x12\x15\n\rrefresh_token\x18\x01 \x01(\t\";\n\x0c\x41uthResponse\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x01 \x01(\t\x12\x15\n\rrefresh_token\x18\x02 \x01(\t\",\n\x14ValidateTokenRequest\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x01 \x01(\t\"7\n\x15ValidateTokenResponse\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\t\".\n\x15ValidateTokensRequest\x12\x15\n\raccess_tokens\x18\x01 \x03(\t\"I\n\x0bTokenStatus\x12\r\n\x05valid\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\r\n\x05scope\x18\x03 \x01(\t\x12\x0b\n\x03\x65xp\x18\x04 \x01(\x03\"?\n\x16ValidateTokensResponse\x12%\n\x07results\x18\x01 \x03(\x0b\x32\x14.auth.v1.TokenStatus2\xdd\x02\n\rAuthServiceV1\x12\x37\n\x06Signup\x12\x16.auth.v1.SignupRequest\x1a\x15.auth.v1.AuthResponse\x12\x35\n\x05Login\x12\x15.auth.v1.LoginRequest\x1a\x15.auth.v1.AuthResponse\x12\x39\n\x07Refresh\x12\x17.auth.v1.RefreshRequest\x1a\x15.auth.v1.AuthResponse\x12N\n\rValidateToken\x12\x1d.auth.v1.ValidateTokenRequest\x1a\x1e.auth.v1.ValidateTokenResponse\x12Q\n\x0eValidateTokens\x12\x1e.auth.v1.ValidateTokensRequest\x1a\x1f.auth.v1.ValidateTokensResponseB\x1eZ\x1cnucleus/proto/auth/v1;authv1b\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'auth_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'Z\034nucleus/proto/auth/v1;authv1'
+  _globals['_SIGNUPREQUEST']._serialized_start=23
+  _globals['_SIGNUPREQUEST']._serialized_end=71
+  _globals['_LOGINREQUEST']._serialized_start=73
+  _globals['_LOGINREQUEST']._serialized_end=120
+  _globals['_REFRESHREQUEST']._serialized_start=122
+  _globals['_REFRESHREQUEST']._serialized_end=161
+  _globals['_AUTHRESPONSE']._serialized_start=163
+  _globals['_AUTHRESPONSE']._serialized_end=222
+  _globals['_VALIDATETOKENREQUEST']._serialized_start=224
+  _globals['_VALIDATETOKENREQUEST']._serialized_end=268
+  _globals['_VALIDATETOKENRESPONSE']._serialized_start=270
+  _globals['_VALIDATETOKENRESPONSE']._serialized_end=325
+  _globals['_VALIDATETOKENSREQUEST']._serialized_start=327
+  _globals['_VALIDATETOKENSREQUEST']._serialized_end=373
+  _globals['_TOKENSTATUS']._serialized_start=375
+  _globals['_TOKENSTATUS']._serialized_end=448
+  _globals['_VALIDATETOKENSRESPONSE']._serialized_start=450
+  _globals['_VALIDATETOKENSRESPONSE']._serialized_end=513
+  _globals['_AUTHSERVICEV1']._serialized_start=516
+  _globals['_AUTHSERVICEV1']._serialized_end=865
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,155 @@
+"""
+AuthServiceV1 (proto/auth/auth.proto) served over grpc.aio.
+
+Signup and Login run the same account logic as the HTTP endpoints and
+return an access token for ``GRPC_AUDIENCE`` plus a rotating refresh token,
+which Refresh exchanges without a password verify. ValidateToken and the batched
+ValidateTokens verify in process through the shared claims cache, so a
+service holding a persistent channel pays one protobuf round trip per check.
+Like /introspect, they require ``authorization`` metadata carrying HTTP Basic
+credentials from ``INTROSPECT_CLIENTS``.
+"""
+import time
+from typing import Optional
+
+import grpc
+import jwt
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.accounts import EmailAlreadyRegistered, authenticate, register_user
+from app.config.settings import Settings
+from app.database import get_async_engine
+from app.metrics import REQUEST_LATENCY
+from app.oauth.helper import access_token_claims, sign_jwt
+from app.oauth.refresh import issue_refresh_token, rotate_refresh_token
+from app.oidc.verify import verify_access_token_async, verify_tokens_async
+from app.schemas.signup import SignupRequest
+from app.security.clients import authenticate_client
+from app.security.hashing import HashingBusy
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from . import auth_pb2, auth_pb2_grpc
+
+settings = Settings()
+
+
+def _session() -> AsyncSession:
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+async def _issue(user_id: str, refresh_token: Optional[str] = None) -> auth_pb2.AuthResponse:
+    claims = access_token_claims(user_id, settings.GRPC_AUDIENCE, "openid")
+    access_token = await run_in_threadpool(sign_jwt, claims)
+    if refresh_token is None:
+        refresh_token = await issue_refresh_token(user_id, settings.GRPC_AUDIENCE, "openid")
+    return auth_pb2.AuthResponse(access_token=access_token, refresh_token=refresh_token)
+
+
+async def _require_client(context) -> None:
+    metadata = dict(context.invocation_metadata() or ())
+    if authenticate_client(metadata.get("authorization")) is None:
+        await context.abort(grpc.StatusCode.UNAUTHENTICATED, "invalid_client")
+
+
+class AuthService(auth_pb2_grpc.AuthServiceV1Servicer):
+
+    async def Signup(self, request, context):
+        try:
+            payload = SignupRequest(email=request.email, password=request.password)
+        except ValidationError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "invalid_request")
+
+        async with _session() as session:
+            try:
+                user = await register_user(session, payload.email, payload.password)
+            except EmailAlreadyRegistered:
+                await context.abort(grpc.StatusCode.ALREADY_EXISTS, "email_already_registered")
+
+        return await _issue(str(user.id))
+
+    async def Login(self, request, context):
+        async with _session() as session:
+            user_id = await authenticate(session, request.email, request.password)
+
+        if not user_id:
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "invalid_credential")
+
+        return await _issue(str(user_id))
+
+    async def Refresh(self, request, context):
+        rotated = await rotate_refresh_token(request.refresh_token, settings.GRPC_AUDIENCE)
+        if not rotated:
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "invalid_refresh_token")
+
+        new_refresh_token, spent = rotated
+        return await _issue(spent.user_id, new_refresh_token)
+
+    async def ValidateToken(self, request, context):
+        await _require_client(context)
+        try:
+            claims = await verify_access_token_async(request.access_token)
+        except jwt.PyJWTError:
+            return auth_pb2.ValidateTokenResponse(valid=False)
+
+        return auth_pb2.ValidateTokenResponse(valid=True, user_id=claims["sub"])
+
+    async def ValidateTokens(self, request, context):
+        await _require_client(context)
+        if len(request.access_tokens) > settings.INTROSPECT_MAX_BATCH:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "too_many_tokens")
+
+        results = await verify_tokens_async(list(request.access_tokens))
+
+        return auth_pb2.ValidateTokensResponse(results=[
+            auth_pb2.TokenStatus(valid=True, user_id=claims["sub"], scope=claims.get("scope", ""), exp=claims.get("exp", 0))
+            if claims is not None else auth_pb2.TokenStatus(valid=False)
+            for claims in results
+        ])
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Records RPC latency in the HTTP request histogram, labelled by method path"""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        method = handler_call_details.method
+        behavior = handler.unary_unary
+
+        async def timed(request, context):
+            started = time.perf_counter()
+            status = "OK"
+            try:
+                return await behavior(request, context)
+            except HashingBusy:
+                status = grpc.StatusCode.RESOURCE_EXHAUSTED.name
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "hashing_overloaded")
+            except grpc.aio.AbortError:
+                status = context.code().name if context.code() else "UNKNOWN"
+                raise
+            except Exception:
+                status = grpc.StatusCode.INTERNAL.name
+                raise
+            finally:
+                REQUEST_LATENCY.labels("GRPC", method, status).observe(time.perf_counter() - started)
+
+        return grpc.unary_unary_rpc_method_handler(
+            timed,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+
+async def start_grpc_server(port: int, max_concurrent_rpcs: Optional[int] = None) -> grpc.aio.Server:
+    """Start AuthServiceV1 on the given port and return the running server"""
+    server = grpc.aio.server(
+        interceptors=[MetricsInterceptor()],
+        maximum_concurrent_rpcs=max_concurrent_rpcs,
+    )
+    auth_pb2_grpc.add_AuthServiceV1Servicer_to_server(AuthService(), server)
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    return server
@@ -0,0 +1,14 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+class BatchIntrospectRequest(BaseModel):
+    tokens: List[str]
+
+class TokenStatus(BaseModel):
+    valid: bool
+    sub: Optional[str] = None
+    scope: Optional[str] = None
+    exp: Optional[int] = None
+
+class BatchIntrospectResponse(BaseModel):
+    results: List[TokenStatus]
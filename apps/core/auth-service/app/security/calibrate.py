@@ -0,0 +1,124 @@
+"""
+Argon2 parameter calibration.
+
+Benchmarks verify latency for candidate (time_cost, memory_cost,
+parallelism) combinations on the current machine and picks the strongest
+one whose p95 stays under a target. Run it inside a pod with production
+CPU/memory limits so the result reflects what /login will actually see.
+"""
+import math
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from argon2 import PasswordHasher
+
+# OWASP minimum for argon2id
+MIN_MEMORY_KIB = 19 * 1024
+MAX_TIME_COST = 10
+SAMPLE_PASSWORD = "calibration-password-0123456789"
+
+
+def available_cpus() -> float:
+    """CPUs available to this process, honouring cgroup v2 quotas (e.g. a 500m k8s limit)"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, int(quota) / int(period))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+def measure_verify(time_cost: int, memory_cost: int, parallelism: int, samples: int, percentile: float) -> float:
+    """Return the given percentile of verify latency in milliseconds"""
+    ph = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = ph.hash(SAMPLE_PASSWORD)
+
+    durations: List[float] = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        ph.verify(hashed, SAMPLE_PASSWORD)
+        durations.append((time.perf_counter() - started) * 1000)
+
+    durations.sort()
+    return durations[min(len(durations) - 1, math.ceil(percentile * len(durations)) - 1)]
+
+
+def memory_candidates(max_memory_kib: int) -> List[int]:
+    """Powers of two from the budget down to the OWASP minimum"""
+    candidates = []
+    memory = 1 << (max_memory_kib.bit_length() - 1)
+    while memory >= MIN_MEMORY_KIB:
+        candidates.append(memory)
+        memory //= 2
+    return candidates or [MIN_MEMORY_KIB]
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_kib: int,
+    samples: int = 10,
+    percentile: float = 0.95,
+    verbose: bool = True,
+) -> Optional[Dict[str, int]]:
+    """
+    Find the strongest parameters with a verify latency under target_ms.
+    "Strongest" means the largest time_cost * memory_cost; parallelism is
+    capped by the CPUs actually available, since extra lanes on a throttled
+    pod only add contention.
+    """
+    max_parallelism = max(1, math.ceil(available_cpus()))
+    parallelisms = sorted({1, max_parallelism})
+
+    best: Optional[Dict[str, int]] = None
+    best_cost = 0
+
+    for parallelism in parallelisms:
+        for memory_cost in memory_candidates(max_memory_kib):
+            if memory_cost * MAX_TIME_COST <= best_cost:
+                break
+
+            for time_cost in range(1, MAX_TIME_COST + 1):
+                latency = measure_verify(time_cost, memory_cost, parallelism, samples, percentile)
+                if verbose:
+                    print(
+                        f"  t={time_cost} m={memory_cost // 1024}MiB p={parallelism}: "
+                        f"p{int(percentile * 100)}={latency:.1f}ms"
+                    )
+                if latency > target_ms:
+                    break
+
+                cost = time_cost * memory_cost
+                if cost > best_cost:
+                    best_cost = cost
+                    best = {
+                        "ARGON2_TIME_COST": time_cost,
+                        "ARGON2_MEMORY_COST": memory_cost,
+                        "ARGON2_PARALLELISM": parallelism,
+                        "latency_ms": round(latency, 1),
+                    }
+
+    return best
+
+
+def write_env(path: str, values: Dict[str, int]) -> None:
+    """Set KEY=value lines in an env file, keeping every other line as-is"""
+    env_path = Path(path)
+    lines = env_path.read_text().splitlines() if env_path.exists() else []
+
+    remaining = dict(values)
+    for i, line in enumerate(lines):
+        key = line.split("=", 1)[0].strip()
+        if key in remaining:
+            lines[i] = f"{key}={remaining.pop(key)}"
+    lines.extend(f"{key}={value}" for key, value in remaining.items())
+
+    env_path.write_text("\n".join(lines) + "\n")
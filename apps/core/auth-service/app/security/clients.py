@@ -0,0 +1,53 @@
+"""
+Client authentication for the token introspection endpoints.
+
+Callers such as the API gateway send HTTP Basic credentials from
+``INTROSPECT_CLIENTS``, both to /introspect over HTTP and as ``authorization``
+metadata on the ValidateToken(s) RPCs. Per RFC 6749 2.3.1 the id and secret
+are form-encoded before being joined with ":".
+"""
+import base64
+import binascii
+import hmac
+from typing import Optional
+from urllib.parse import unquote_plus
+
+from fastapi import Header, HTTPException
+
+from app.config.settings import Settings
+
+settings = Settings()
+
+
+def authenticate_client(authorization: Optional[str]) -> Optional[str]:
+    """client_id for valid Basic credentials, otherwise None"""
+    if not authorization:
+        return None
+    scheme, _, encoded = authorization.partition(" ")
+    if scheme.lower() != "basic":
+        return None
+
+    try:
+        decoded = base64.b64decode(encoded.strip(), validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    client_id, sep, secret = decoded.partition(":")
+    if not sep:
+        return None
+    client_id, secret = unquote_plus(client_id), unquote_plus(secret)
+
+    expected = settings.INTROSPECT_CLIENTS.get(client_id)
+    if not expected or not hmac.compare_digest(expected.encode(), secret.encode()):
+        return None
+    return client_id
+
+
+def require_introspection_client(authorization: str = Header(None)) -> str:
+    client_id = authenticate_client(authorization)
+    if client_id is None:
+        raise HTTPException(
+            status_code=401,
+            detail="invalid_client",
+            headers={"WWW-Authenticate": 'Basic realm="introspect"'},
+        )
+    return client_id
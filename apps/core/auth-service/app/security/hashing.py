@@ -0,0 +1,140 @@
+"""
+Dedicated executor for password hashing.
+
+argon2 is deliberately slow and memory-hard. Running it on Starlette's
+shared threadpool lets a login spike starve every other sync endpoint, so
+hashes run on their own small pool with a bounded queue instead. When the
+queue is full, callers get HashingBusy straight away and the API answers
+503 with Retry-After rather than piling up requests.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.metrics import observe_stage
+
+# Latency samples kept per operation for percentile reporting
+SAMPLE_WINDOW = 1024
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("hashing_overloaded")
+        self.retry_after = retry_after
+
+
+class LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: deque = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 2),
+            "p95_ms": round(self.percentile(0.95) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class HashingExecutor:
+    """A size-limited thread or process pool with admission control."""
+
+    def __init__(self, workers: int, queue_size: int, mode: str = "thread", retry_after: int = 1):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing executor mode: {mode}")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.mode = mode
+        self.retry_after = retry_after
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.pending = 0
+        self.rejected = 0
+        self.latency: Dict[str, LatencyStats] = {}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.mode == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="argon2"
+                        )
+        return self._executor
+
+    def _done(self, op: str, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.pending -= 1
+            self.latency.setdefault(op, LatencyStats()).observe(elapsed)
+        self._slots.release()
+        observe_stage(f"argon2_{op}", elapsed)
+
+    def submit(self, op: str, fn: Callable, *args) -> Future:
+        """Queue a hashing call, or raise HashingBusy if the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy(self.retry_after)
+
+        with self._lock:
+            self.pending += 1
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._done(op, started)
+            raise
+        future.add_done_callback(lambda _: self._done(op, started))
+        return future
+
+    def run(self, op: str, fn: Callable, *args):
+        """Run a hashing call on the pool and wait for its result"""
+        return self.submit(op, fn, *args).result()
+
+    async def run_async(self, op: str, fn: Callable, *args):
+        """Run a hashing call on the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(op, fn, *args))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self.pending,
+                "queue_depth": max(0, self.pending - self.workers),
+                "rejected": self.rejected,
+                "latency": {op: stats.to_dict() for op, stats in self.latency.items()},
+            }
@@ -1,19 +1,60 @@
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
-ph = PasswordHasher()
+from app.config.settings import Settings
+from app.security.hashing import HashingExecutor
+
+settings = Settings()
+
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+hashing_executor = HashingExecutor(
+    workers=settings.HASHING_WORKERS,
+    queue_size=settings.HASHING_QUEUE_SIZE,
+    mode=settings.HASHING_MODE,
+    retry_after=settings.HASHING_RETRY_AFTER,
+)
+
+def _hash(password: str) -> str:
+    return ph.hash(password)
+
+def _verify(hash: str, password: str) -> bool:
+    try:
+        return ph.verify(hash, password)
+    except VerifyMismatchError:
+        return False
 
 def hash_password(password: str) -> str:
     """
     Encrypt the password
     """
-    return ph.hash(password)
+    return hashing_executor.run("hash", _hash, password)
 
 def verify_password(hash: str, password: str) -> bool:
     """
     Verify password against hashed stored value.
     """
-    try:
-        return ph.verify(hash, password)
-    except VerifyMismatchError:
-        return False
\ No newline at end of file
+    return hashing_executor.run("verify", _verify, hash, password)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Encrypt the password without blocking the event loop
+    """
+    return await hashing_executor.run_async("hash", _hash, password)
+
+async def verify_password_async(hash: str, password: str) -> bool:
+    """
+    Verify password against hashed stored value without blocking the event loop.
+    """
+    return await hashing_executor.run_async("verify", _verify, hash, password)
+
+def needs_rehash(hash: str) -> bool:
+    """
+    Check whether a stored hash was made with different parameters than the current ones.
+    """
+    return ph.check_needs_rehash(hash)
@@ -14,12 +14,12 @@ def verify_session(token: str, max_age: int = 3600):
     return serializer.loads(token, max_age)
 
 
-def get_current_user(nucelus_session: str = Cookie(None)):
-    if not nucelus_session:
+def get_current_user(nucleus_session: str = Cookie(None)):
+    if not nucleus_session:
         raise HTTPException(status_code=401, detail="login_required")
     
     try:
-        payload = verify_session(nucelus_session)
+        payload = verify_session(nucleus_session)
         return payload["sub"]
     except Exception:
         raise HTTPException(status_code=401, detail="invalid_session")
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for app/oauth/encoder.py.
+
+Times jwt.encode (the previous sign_jwt) against the encoder for RS256,
+ES256 and EdDSA keys, and signing the /token pair as two calls against one
+encode_many. Compatibility with PyJWT is covered by tests/test_jwt_encoder.py.
+
+    python benchmarks/jwt_encoder.py
+    python benchmarks/jwt_encoder.py --iterations 5000
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.oauth.encoder import JWTEncoder
+from app.oauth.keyring import Key, algorithm_for
+
+ISSUER = "https://nucleus.example.com"
+
+
+def make_key(kid: str, private_key) -> Key:
+    public_key = private_key.public_key()
+    return Key(kid=kid, public_key=public_key, private_key=private_key, alg=algorithm_for(public_key))
+
+
+def bench_keys():
+    return [
+        make_key("bench-rs256", rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+        make_key("bench-es256", ec.generate_private_key(ec.SECP256R1())),
+        make_key("bench-eddsa", ed25519.Ed25519PrivateKey.generate()),
+    ]
+
+
+def sample_claims():
+    exp = datetime.now() + timedelta(minutes=15)
+    return [
+        {"iss": ISSUER, "sub": "7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d", "aud": "forms-web", "scope": "openid email profile", "exp": exp},
+        {"iss": ISSUER, "sub": "user-1", "aud": "forms-web", "email": "dev@nucleus.local", "email_verified": True, "exp": exp},
+        {"iss": ISSUER, "sub": "user-2", "aud": "nucleus-internal", "scope": "openid", "exp": int(exp.timestamp()), "iat": datetime.now()},
+        {"iss": ISSUER, "sub": "user-3", "aud": ["a", "b"], "scope": "", "exp": exp, "nested": {"roles": ["admin"], "n": 1}},
+    ]
+
+
+def pyjwt_encode(key: Key, claims: dict) -> str:
+    """sign_jwt before the encoder"""
+    return jwt.encode(claims, key.private_key, algorithm=key.alg, headers={"kid": key.kid})
+
+
+def timed(fn, iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def benchmark(keys, iterations: int):
+    claims = sample_claims()[0]
+    id_claims = sample_claims()[1]
+    encoder = JWTEncoder()
+
+    print(f"{'alg':6} {'jwt.encode':>12} {'encoder':>10} {'speedup':>8}   {'pair x2':>10} {'encode_many':>12}   (us per call, {iterations} iterations)")
+    for key in keys:
+        baseline = timed(lambda: pyjwt_encode(key, claims), iterations)
+        fast = timed(lambda: encoder.encode(key, claims), iterations)
+        pair = timed(lambda: (pyjwt_encode(key, claims), pyjwt_encode(key, id_claims)), iterations)
+        many = timed(lambda: encoder.encode_many(key, [claims, id_claims]), iterations)
+        print(f"{key.alg:6} {baseline:>12.1f} {fast:>10.1f} {baseline / fast:>7.2f}x   {pair:>10.1f} {many:>12.1f}")
+
+    # Signature cost dominates above; this isolates the part the encoder replaces
+    print("\nExcluding the signature (header + claims serialization only):")
+    algorithm = jwt.algorithms.get_default_algorithms()["HS256"]
+    secret = algorithm.prepare_key(b"x" * 32)
+    baseline = timed(lambda: jwt.encode(claims, secret, algorithm="HS256", headers={"kid": "k"}), iterations)
+    hs_key = Key(kid="k", public_key=None, private_key=secret, alg="HS256")
+    fast = timed(lambda: encoder.encode(hs_key, claims), iterations)
+    print(f"{'HS256':6} {baseline:>12.1f} {fast:>10.1f} {baseline / fast:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT encoder benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    benchmark(bench_keys(), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
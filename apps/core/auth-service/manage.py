@@ -10,10 +10,23 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from app.migrations import check_migration_status, run_migrations
-from app.db_utils import cleanup_expired_codes, get_active_codes_count
+from app.db_utils import cleanup_expired_codes, cleanup_expired_refresh_tokens
+from app.partitions import maintain_partitions
+from app.stats import collect_stats
+from app.security.calibrate import calibrate, write_env
+from app.config.settings import Settings
+from app.oauth.keyring import SUPPORTED_ALGORITHMS, default_prepublish_seconds, generate_key
+from app.importer import CONFLICT_STRATEGIES, DEFAULT_BATCH_SIZE, FORMATS, import_users
 from alembic.config import Config
 from alembic import command
 
+def positive_int(value: str) -> int:
+    """argparse type for sizes and counts that must be at least 1"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
 def create_migration(message: str, autogenerate: bool = True):
     """Create a new migration"""
     config = Config("alembic.ini")
@@ -50,15 +63,99 @@ def migration_history():
     config = Config("alembic.ini")
     command.history(config, verbose=True)
 
-def cleanup_database():
-    """Clean up expired authorization codes"""
-    count = cleanup_expired_codes()
-    print(f"✅ Cleaned up {count} expired authorization codes")
+def cleanup_database(chunk_size: int):
+    """Clean up expired authorization codes and refresh tokens"""
+    result = cleanup_expired_codes(chunk_size)
+    print(
+        f"✅ Cleaned up {result['deleted']} expired authorization codes "
+        f"in {result['chunks']} chunks ({result['rows_per_sec']} rows/sec)"
+    )
+    result = cleanup_expired_refresh_tokens(chunk_size)
+    print(f"✅ Cleaned up {result['deleted']} expired refresh tokens")
+
+def manage_partitions(hours_ahead: int):
+    """Pre-create and drop hourly authorization code partitions"""
+    result = maintain_partitions(hours_ahead)
+    if result is None:
+        print("authorization_codes is not partitioned; nothing to do")
+        return
+    print(f"✅ Created {len(result['created'])} partitions, dropped {len(result['dropped'])}")
+    for name in result["dropped"]:
+        print(f"  dropped {name}")
 
 def database_stats():
     """Show database statistics"""
-    active_codes = get_active_codes_count()
-    print(f"Active authorization codes: {active_codes}")
+    stats = collect_stats()
+    print(f"Active authorization codes: {stats['active_authorization_codes']}")
+    for table in ("users", "authorization_codes"):
+        figure = stats[table]
+        print(f"{table}: {'~' if figure['estimated'] else ''}{figure['count']} rows")
+    per_minute = stats["codes_per_minute"]
+    print(f"Codes expired unused in the last minute: {per_minute['expired_unused']}")
+    if stats["table_size_bytes"]:
+        for table, size in stats["table_size_bytes"].items():
+            print(f"{table} size: {size / 1024 / 1024:.1f} MiB")
+
+def calibrate_hashing(target_ms: float, memory_budget_mib: int, workers: int, samples: int, env_file: str, dry_run: bool):
+    """Benchmark argon2 parameters and write the chosen ones to the env file"""
+    max_memory_kib = memory_budget_mib * 1024 // max(1, workers)
+    print(f"Calibrating argon2 for p95 verify <= {target_ms}ms, <= {max_memory_kib // 1024}MiB per hash")
+
+    result = calibrate(target_ms, max_memory_kib, samples=samples)
+    if result is None:
+        print("❌ No parameters meet the target; raise --target-ms or the memory budget")
+        sys.exit(1)
+
+    latency = result.pop("latency_ms")
+    for key, value in result.items():
+        print(f"{key}={value}")
+    print(f"Expected p95 verify latency: {latency}ms")
+
+    if not dry_run:
+        write_env(env_file, result)
+        print(f"✅ Wrote argon2 settings to {env_file}")
+
+def generate_signing_key(kid: str, alg: str, keys_dir: str):
+    """Create a new signing key in the key directory"""
+    path = generate_key(keys_dir, kid, alg)
+    print(f"✅ Wrote {alg} key {kid} to {path}")
+    settings = Settings()
+    print(
+        f"Servers publish it in the JWKS within {settings.KEY_RELOAD_INTERVAL:g}s (or at once on "
+        f"POST /admin/keys/reload or SIGHUP) and start signing with it {default_prepublish_seconds():g}s "
+        "after it was written (KEY_PREPUBLISH_SECONDS)"
+    )
+    if settings.SIGNING_KID:
+        print(f"SIGNING_KID pins {settings.SIGNING_KID}; change it to sign with the new key")
+
+def print_import_progress(stats: dict):
+    print(
+        f"  {stats['records']:,} records: {stats['inserted']:,} inserted, {stats['updated']:,} updated, "
+        f"{stats['skipped']:,} skipped, {stats['rejected']:,} rejected ({stats['rows_per_sec']:,} rows/sec)"
+    )
+
+def import_users_file(path: str, fmt: str, batch_size: int, workers: int, on_conflict: str, checkpoint: str, restart: bool, rejects: str):
+    """Bulk load users from a CSV or JSONL export"""
+    print(f"Importing users from {path} (on conflict: {on_conflict})")
+    try:
+        stats = import_users(
+            path,
+            fmt=fmt,
+            batch_size=batch_size,
+            workers=workers,
+            on_conflict=on_conflict,
+            checkpoint_path=checkpoint,
+            restart=restart,
+            rejects_path=rejects,
+            progress=print_import_progress,
+        )
+    except KeyboardInterrupt:
+        print("❌ Interrupted; run the same command again to resume from the last checkpoint")
+        sys.exit(1)
+    print(
+        f"✅ Imported {stats['records']:,} records in {stats['seconds']}s: {stats['inserted']:,} inserted, "
+        f"{stats['updated']:,} updated, {stats['skipped']:,} skipped, {stats['rejected']:,} rejected"
+    )
 
 def main():
     parser = argparse.ArgumentParser(description="Database management script")
@@ -78,9 +175,36 @@ def main():
     subparsers.add_parser("history", help="Show migration history")
 
     # Database maintenance commands
-    subparsers.add_parser("cleanup", help="Clean up expired authorization codes")
+    cleanup_parser = subparsers.add_parser("cleanup", help="Clean up expired authorization codes")
+    cleanup_parser.add_argument("--chunk-size", type=positive_int, default=5000, help="Rows deleted per transaction")
     subparsers.add_parser("stats", help="Show database statistics")
 
+    partitions_parser = subparsers.add_parser("partitions", help="Maintain hourly authorization code partitions")
+    partitions_parser.add_argument("--hours-ahead", type=int, default=24, help="Hours of partitions to pre-create")
+
+    calibrate_parser = subparsers.add_parser("calibrate-hashing", help="Benchmark and pick argon2 parameters")
+    calibrate_parser.add_argument("--target-ms", type=float, default=250.0, help="Target p95 verify latency")
+    calibrate_parser.add_argument("--memory-budget-mib", type=int, default=128, help="Memory available for hashing across all workers")
+    calibrate_parser.add_argument("--workers", type=int, default=2, help="Concurrent hashes sharing the memory budget (HASHING_WORKERS)")
+    calibrate_parser.add_argument("--samples", type=int, default=10, help="Verifies measured per candidate")
+    calibrate_parser.add_argument("--env-file", default=".env", help="Env file to write settings to")
+    calibrate_parser.add_argument("--dry-run", action="store_true", help="Print settings without writing them")
+
+    key_parser = subparsers.add_parser("generate-key", help="Create a new token signing key")
+    key_parser.add_argument("kid", help="Key ID, also used for the file name")
+    key_parser.add_argument("--alg", choices=SUPPORTED_ALGORITHMS, default="ES256", help="Signing algorithm")
+    key_parser.add_argument("--keys-dir", default=Settings().KEYS_DIR, help="Key directory")
+
+    import_parser = subparsers.add_parser("import-users", help="Bulk load users from a CSV or JSONL file")
+    import_parser.add_argument("path", help="Input file with email and password or password_hash columns")
+    import_parser.add_argument("--format", choices=FORMATS, help="Input format (default: from the file extension)")
+    import_parser.add_argument("--batch-size", type=positive_int, default=DEFAULT_BATCH_SIZE, help="Records per COPY batch and checkpoint")
+    import_parser.add_argument("--workers", type=int, help="Processes hashing plaintext passwords (default: all cores)")
+    import_parser.add_argument("--on-conflict", choices=CONFLICT_STRATEGIES, default="skip", help="What to do with emails that already exist")
+    import_parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint.json)")
+    import_parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the top")
+    import_parser.add_argument("--rejects", help="Write the line number and reason of each rejected record here")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -99,9 +223,17 @@ def main():
         elif args.command == "history":
             migration_history()
         elif args.command == "cleanup":
-            cleanup_database()
+            cleanup_database(args.chunk_size)
         elif args.command == "stats":
             database_stats()
+        elif args.command == "partitions":
+            manage_partitions(args.hours_ahead)
+        elif args.command == "calibrate-hashing":
+            calibrate_hashing(args.target_ms, args.memory_budget_mib, args.workers, args.samples, args.env_file, args.dry_run)
+        elif args.command == "generate-key":
+            generate_signing_key(args.kid, args.alg, args.keys_dir)
+        elif args.command == "import-users":
+            import_users_file(args.path, args.format, args.batch_size, args.workers, args.on_conflict, args.checkpoint, args.restart, args.rejects)
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
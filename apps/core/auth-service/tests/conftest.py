@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from sqlmodel import SQLModel
+
+import app.database as database
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Point the app's engines at a fresh SQLite database with every table created"""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("DB_ECHO", "false")
+    database.get_settings.cache_clear()
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database, "async_engine", None)
+
+    engine = database.get_engine()
+    SQLModel.metadata.create_all(engine)
+    yield engine
+
+    if database.async_engine is not None:
+        asyncio.run(database.async_engine.dispose())
+    engine.dispose()
+    database.get_settings.cache_clear()
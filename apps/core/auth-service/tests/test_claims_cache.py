@@ -0,0 +1,72 @@
+"""ClaimsCache: LRU eviction, expiry at min(exp, ttl) and the disabled cache."""
+from types import SimpleNamespace
+
+import pytest
+
+import app.oidc.claims_cache as claims_cache_module
+from app.oidc.claims_cache import ClaimsCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1_700_000_000.0)
+    monkeypatch.setattr(claims_cache_module, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def claims(sub: str, exp: float) -> dict:
+    return {"sub": sub, "exp": exp}
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity(clock):
+    cache = ClaimsCache(max_size=2, ttl=60)
+    cache.put("a", claims("a", clock.now + 900))
+    cache.put("b", claims("b", clock.now + 900))
+    assert cache.get("a") is not None  # b is now the least recently used
+
+    cache.put("c", claims("c", clock.now + 900))
+
+    assert cache.get("b") is None
+    assert cache.get("a")["sub"] == "a"
+    assert cache.get("c")["sub"] == "c"
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl_when_the_token_outlives_it(clock):
+    cache = ClaimsCache(max_size=10, ttl=60)
+    cache.put("token", claims("a", clock.now + 900))
+
+    clock.now += 59
+    assert cache.get("token") is not None
+    clock.now += 1
+    assert cache.get("token") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entry_expires_with_the_token_before_ttl(clock):
+    cache = ClaimsCache(max_size=10, ttl=60)
+    cache.put("token", claims("a", clock.now + 10))
+
+    clock.now += 9
+    assert cache.get("token") is not None
+    clock.now += 1
+    assert cache.get("token") is None
+
+
+def test_size_zero_disables_the_cache(clock):
+    cache = ClaimsCache(max_size=0, ttl=60)
+    cache.put("token", claims("a", clock.now + 900))
+
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_clear_drops_every_entry(clock):
+    cache = ClaimsCache(max_size=10, ttl=60)
+    cache.put("a", claims("a", clock.now + 900))
+    cache.put("b", claims("b", clock.now + 900))
+
+    cache.clear()
+
+    assert cache.get("a") is None and cache.get("b") is None
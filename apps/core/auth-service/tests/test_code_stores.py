@@ -0,0 +1,158 @@
+"""Authorization code stores: every backend redeems a code exactly once.
+
+The Redis backend runs against fakeredis, a local stand-in for a Redis
+server, and the SQL backend against a temporary SQLite database.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import app.oauth.codes.memory_store as memory_store_module
+from app.models.oauth import AuthorizationCode
+from app.oauth.codes.memory_store import MemoryCodeStore
+from app.oauth.codes.redis_store import KEY_PREFIX, RedisCodeStore
+from app.oauth.codes.sql_store import SQLCodeStore
+
+
+def make_code(code: str, lifetime: timedelta = timedelta(minutes=5)) -> AuthorizationCode:
+    return AuthorizationCode(
+        code=code,
+        user_id="7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d",
+        client_id="forms-web",
+        redirect_uri="https://forms.example.com/callback",
+        scope="openid email",
+        code_challenge="E9Melhoa2OwvFrEMTJguCHaoeK1t8URWbuGJSstw-cM",
+        code_challenge_method="S256",
+        expires_at=datetime.now() + lifetime,
+    )
+
+
+def redis_store() -> RedisCodeStore:
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisCodeStore("redis://unused", client=fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture(params=["memory", "sql", "redis"])
+def store(request):
+    if request.param == "memory":
+        return MemoryCodeStore()
+    if request.param == "sql":
+        request.getfixturevalue("sqlite_db")
+        return SQLCodeStore()
+    return redis_store()
+
+
+def test_save_then_redeem(store):
+    async def scenario():
+        saved = make_code("code-1")
+        assert await store.save(saved) == "code-1"
+
+        redeemed = await store.redeem("code-1")
+        assert redeemed is not None
+        assert redeemed.user_id == saved.user_id
+        assert redeemed.scope == saved.scope
+        assert redeemed.code_challenge == saved.code_challenge
+        assert redeemed.expires_at == saved.expires_at
+
+    asyncio.run(scenario())
+
+
+def test_second_redeem_returns_none(store):
+    async def scenario():
+        await store.save(make_code("code-2"))
+        assert await store.redeem("code-2") is not None
+        assert await store.redeem("code-2") is None
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_redeems_hand_out_the_code_once(store):
+    async def scenario():
+        await store.save(make_code("code-3"))
+        results = await asyncio.gather(*[store.redeem("code-3") for _ in range(10)])
+        assert sum(result is not None for result in results) == 1
+
+    asyncio.run(scenario())
+
+
+def test_unknown_code_returns_none(store):
+    assert asyncio.run(store.redeem("never-issued")) is None
+
+
+def test_code_expires_after_its_lifetime(store):
+    async def scenario():
+        await store.save(make_code("code-4", lifetime=timedelta(milliseconds=200)))
+        time.sleep(0.3)
+        assert await store.redeem("code-4") is None
+
+    asyncio.run(scenario())
+
+
+def test_already_expired_code_cannot_be_redeemed(store):
+    async def scenario():
+        await store.save(make_code("code-5", lifetime=timedelta(seconds=-1)))
+        assert await store.redeem("code-5") is None
+
+    asyncio.run(scenario())
+
+
+def test_memory_store_timer_wheel_drops_expired_codes(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(memory_store_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    store = MemoryCodeStore(max_ttl=60, tick=1.0)
+
+    async def scenario():
+        await store.save(make_code("short", lifetime=timedelta(seconds=10)))
+        await store.save(make_code("long", lifetime=timedelta(seconds=30)))
+
+        clock.now += 11
+        # Any call advances the wheel; only the short code's slot has come due
+        assert await store.redeem("unknown") is None
+        assert len(store) == 1
+
+        clock.now += 20
+        assert await store.redeem("long") is None
+        assert len(store) == 0
+
+    asyncio.run(scenario())
+
+
+def test_memory_store_keeps_codes_beyond_the_wheel_span(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(memory_store_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    store = MemoryCodeStore(max_ttl=10, tick=1.0)
+
+    async def scenario():
+        await store.save(make_code("code-6", lifetime=timedelta(seconds=25)))
+
+        # The wheel comes round to the code's slot before its deadline
+        clock.now += 12
+        await store.redeem("unknown")
+        assert len(store) == 1
+
+        assert (await store.redeem("code-6")).code == "code-6"
+
+    asyncio.run(scenario())
+
+
+def test_redis_code_expires_with_the_key_ttl():
+    store = redis_store()
+
+    async def scenario():
+        await store.save(make_code("code-7", lifetime=timedelta(milliseconds=200)))
+        assert await store._client.pttl(KEY_PREFIX + "code-7") > 0
+
+    asyncio.run(scenario())
+
+
+def test_redis_does_not_store_an_already_expired_code():
+    store = redis_store()
+
+    async def scenario():
+        await store.save(make_code("code-8", lifetime=timedelta(seconds=-1)))
+        assert await store._client.exists(KEY_PREFIX + "code-8") == 0
+
+    asyncio.run(scenario())
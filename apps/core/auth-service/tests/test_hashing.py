@@ -0,0 +1,59 @@
+"""HashingExecutor admission control and the 503 + Retry-After response."""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.security.password as password_module
+from app.main import app
+from app.security.hashing import HashingBusy, HashingExecutor
+
+
+@pytest.fixture
+def saturated():
+    """workers=1, queue_size=1, with both slots taken until release() is called"""
+    executor = HashingExecutor(workers=1, queue_size=1, retry_after=7)
+    gate = threading.Event()
+    running = [executor.submit("hash", gate.wait), executor.submit("hash", gate.wait)]
+
+    def release():
+        gate.set()
+        for future in running:
+            future.result(timeout=5)
+
+    executor.release = release
+    yield executor
+    release()
+    executor.shutdown()
+
+
+def test_third_submit_is_rejected_while_worker_and_queue_are_full(saturated):
+    with pytest.raises(HashingBusy) as busy:
+        saturated.submit("hash", lambda: None)
+
+    assert busy.value.retry_after == 7
+    stats = saturated.stats()
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 2
+    assert stats["queue_depth"] == 1
+
+
+def test_slots_are_released_when_hashes_finish(saturated):
+    with pytest.raises(HashingBusy):
+        saturated.submit("hash", lambda: None)
+
+    saturated.release()
+
+    assert saturated.submit("hash", lambda: "done").result(timeout=5) == "done"
+    assert saturated.stats()["rejected"] == 1
+
+
+def test_full_queue_answers_503_with_retry_after(sqlite_db, saturated, monkeypatch):
+    monkeypatch.setattr(password_module, "hashing_executor", saturated)
+
+    response = TestClient(app).post("/signup", json={"email": "busy@example.com", "password": "secret"})
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "hashing_overloaded"}
+    assert response.headers["Retry-After"] == "7"
+    assert saturated.stats()["rejected"] == 1
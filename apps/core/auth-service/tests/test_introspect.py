@@ -0,0 +1,120 @@
+"""Introspection requires client credentials, over HTTP and gRPC alike."""
+import asyncio
+import base64
+import socket
+
+import grpc
+import pytest
+from fastapi.testclient import TestClient
+
+import app.security.clients as clients_module
+from app.main import app
+from app.oauth.helper import access_token_claims, sign_jwt
+from app.rpc import auth_pb2, auth_pb2_grpc
+from app.rpc.server import start_grpc_server
+from app.security.clients import authenticate_client
+
+USER_ID = "7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d"
+
+
+def basic(client_id: str, secret: str) -> str:
+    return "Basic " + base64.b64encode(f"{client_id}:{secret}".encode()).decode()
+
+
+GATEWAY = basic("api-gateway", "gateway-secret")
+
+
+@pytest.fixture(autouse=True)
+def clients(monkeypatch):
+    monkeypatch.setattr(clients_module.settings, "INTROSPECT_CLIENTS", {"api-gateway": "gateway-secret"})
+
+
+@pytest.fixture
+def token():
+    return sign_jwt(access_token_claims(USER_ID, "forms-web", "openid email"))
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("authorization", [
+    None,
+    basic("api-gateway", "wrong"),
+    basic("unknown", "gateway-secret"),
+    "Bearer gateway-secret",
+    "Basic not-base64!",
+])
+def test_bad_client_credentials_are_rejected(client, token, authorization):
+    headers = {"Authorization": authorization} if authorization else {}
+
+    single = client.post("/introspect", data={"token": token}, headers=headers)
+    batch = client.post("/introspect/batch", json={"tokens": [token]}, headers=headers)
+
+    for response in (single, batch):
+        assert response.status_code == 401
+        assert response.json() == {"detail": "invalid_client"}
+        assert response.headers["WWW-Authenticate"].startswith("Basic")
+
+
+def test_authenticated_client_can_introspect(client, token):
+    single = client.post("/introspect", data={"token": token}, headers={"Authorization": GATEWAY})
+    batch = client.post("/introspect/batch", json={"tokens": [token, "garbage"]}, headers={"Authorization": GATEWAY})
+
+    assert single.status_code == 200
+    assert single.json()["active"] is True
+    assert single.json()["sub"] == USER_ID
+    assert batch.status_code == 200
+    assert [result["valid"] for result in batch.json()["results"]] == [True, False]
+
+
+def test_no_configured_clients_rejects_everyone(client, token, monkeypatch):
+    monkeypatch.setattr(clients_module.settings, "INTROSPECT_CLIENTS", {})
+
+    assert client.post("/introspect", data={"token": token}, headers={"Authorization": GATEWAY}).status_code == 401
+
+
+def test_credentials_are_form_decoded():
+    clients_module.settings.INTROSPECT_CLIENTS["edge proxy"] = "p@ss:word"
+
+    assert authenticate_client(basic("edge+proxy", "p%40ss%3Aword")) == "edge proxy"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def test_grpc_validation_requires_client_credentials(token):
+    async def scenario():
+        port = free_port()
+        server = await start_grpc_server(port)
+        try:
+            async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                stub = auth_pb2_grpc.AuthServiceV1Stub(channel)
+
+                for call, request in [
+                    (stub.ValidateToken, auth_pb2.ValidateTokenRequest(access_token=token)),
+                    (stub.ValidateTokens, auth_pb2.ValidateTokensRequest(access_tokens=[token])),
+                ]:
+                    with pytest.raises(grpc.aio.AioRpcError) as denied:
+                        await call(request)
+                    assert denied.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+                    with pytest.raises(grpc.aio.AioRpcError) as denied:
+                        await call(request, metadata=[("authorization", basic("api-gateway", "wrong"))])
+                    assert denied.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+                single = await stub.ValidateToken(
+                    auth_pb2.ValidateTokenRequest(access_token=token), metadata=[("authorization", GATEWAY)])
+                batch = await stub.ValidateTokens(
+                    auth_pb2.ValidateTokensRequest(access_tokens=[token]), metadata=[("authorization", GATEWAY)])
+        finally:
+            await server.stop(None)
+
+        assert single.valid and single.user_id == USER_ID
+        assert [result.valid for result in batch.results] == [True]
+
+    asyncio.run(scenario())
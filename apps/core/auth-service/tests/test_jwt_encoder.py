@@ -0,0 +1,99 @@
+"""JWTEncoder against PyJWT's jwt.encode for every supported key type."""
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.api.jwks import to_jwk
+from app.oauth.encoder import JWTEncoder
+from app.oauth.keyring import Key, algorithm_for
+
+ISSUER = "https://nucleus.example.com"
+
+
+def make_key(kid: str, private_key) -> Key:
+    public_key = private_key.public_key()
+    return Key(kid=kid, public_key=public_key, private_key=private_key, alg=algorithm_for(public_key))
+
+
+KEYS = {
+    "RS256": lambda: make_key("test-rs256", rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+    "ES256": lambda: make_key("test-es256", ec.generate_private_key(ec.SECP256R1())),
+    "EdDSA": lambda: make_key("test-eddsa", ed25519.Ed25519PrivateKey.generate()),
+}
+
+
+def sample_claims():
+    exp = datetime.now() + timedelta(minutes=15)
+    return [
+        {"iss": ISSUER, "sub": "7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d", "aud": "forms-web", "scope": "openid email profile", "exp": exp},
+        {"iss": ISSUER, "sub": "user-1", "aud": "forms-web", "email": "dev@nucleus.local", "email_verified": True, "exp": exp},
+        {"iss": ISSUER, "sub": "user-2", "aud": "nucleus-internal", "scope": "openid", "exp": int(exp.timestamp()), "iat": datetime.now()},
+        {"iss": ISSUER, "sub": "user-3", "aud": ["a", "b"], "scope": "", "exp": exp, "nested": {"roles": ["admin"], "n": 1}},
+    ]
+
+
+def pyjwt_encode(key: Key, claims: dict) -> str:
+    return jwt.encode(claims, key.private_key, algorithm=key.alg, headers={"kid": key.kid})
+
+
+def decode(token: str, key: Key) -> dict:
+    verify_key = jwt.PyJWK(to_jwk(key))
+    return jwt.decode(token, verify_key.key, algorithms=[key.alg], issuer=ISSUER, options={"verify_aud": False})
+
+
+def signing_input(token: str) -> str:
+    return token.rsplit(".", 1)[0]
+
+
+@pytest.fixture(scope="module", params=list(KEYS))
+def key(request):
+    return KEYS[request.param]()
+
+
+@pytest.mark.parametrize("claims", sample_claims())
+def test_round_trip_matches_pyjwt(key, claims):
+    token = JWTEncoder().encode(key, claims)
+    expected = pyjwt_encode(key, claims)
+
+    assert decode(token, key) == decode(expected, key)
+    assert jwt.get_unverified_header(token) == jwt.get_unverified_header(expected)
+    assert signing_input(token) == signing_input(expected)
+    # ES256 signatures are randomized; RS256 and EdDSA are deterministic
+    if key.alg != "ES256":
+        assert token == expected
+
+
+def test_encode_many_matches_encode(key):
+    encoder = JWTEncoder()
+    claims_list = sample_claims()[:2]
+
+    tokens = encoder.encode_many(key, claims_list)
+
+    assert [signing_input(t) for t in tokens] == [signing_input(pyjwt_encode(key, c)) for c in claims_list]
+    assert [decode(t, key) for t in tokens] == [decode(pyjwt_encode(key, c), key) for c in claims_list]
+
+
+def test_replaced_key_under_same_kid_gets_a_new_header():
+    encoder = JWTEncoder()
+    rsa_key = KEYS["RS256"]()
+    es_key = make_key(rsa_key.kid, ec.generate_private_key(ec.SECP256R1()))
+    claims = sample_claims()[0]
+
+    encoder.encode(rsa_key, claims)
+    token = encoder.encode(es_key, claims)
+
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "kid": rsa_key.kid, "typ": "JWT"}
+    assert decode(token, es_key) == decode(pyjwt_encode(es_key, claims), es_key)
+
+
+def test_non_ascii_claims_decode_the_same_but_are_not_byte_identical(key):
+    claims = {"iss": ISSUER, "sub": "user-4", "name": "Zoë Łukasiewicz", "locale": "ja-JP", "nickname": "太郎"}
+
+    token = JWTEncoder().encode(key, claims)
+    expected = pyjwt_encode(key, claims)
+
+    assert decode(token, key) == decode(expected, key) == claims
+    # orjson writes UTF-8 where PyJWT's json.dumps writes \u escapes
+    assert signing_input(token) != signing_input(expected)
@@ -0,0 +1,121 @@
+"""KeyRing rotation: pre-publishing, promotion, pinning and failed reloads."""
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import app.oauth.keyring as keyring_module
+from app.oauth.keyring import KeyRing, generate_key
+
+PREPUBLISH = 300.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock seen by the key ring; advance it with clock.now += seconds"""
+    clock = SimpleNamespace(now=time.time())
+    monkeypatch.setattr(keyring_module, "time", SimpleNamespace(time=lambda: clock.now, monotonic=time.monotonic))
+    return clock
+
+
+def add_key(keys_dir, kid: str, age: float, now: float, alg: str = "EdDSA"):
+    """Write a private key whose file is age seconds old at now"""
+    path = generate_key(str(keys_dir), kid, alg)
+    os.utime(path, (now - age, now - age))
+    return path
+
+
+def make_ring(keys_dir, **kwargs) -> KeyRing:
+    ring = KeyRing(str(keys_dir), check_interval=0.0, prepublish_seconds=PREPUBLISH, **kwargs)
+    ring.load()
+    return ring
+
+
+def test_new_key_is_published_but_does_not_sign_within_the_window(tmp_path, clock):
+    add_key(tmp_path, "old", 10_000, clock.now)
+    add_key(tmp_path, "new", 10, clock.now)
+
+    ring = make_ring(tmp_path)
+
+    assert ring.signing_key().kid == "old"
+    assert {key.kid for key in ring.keys()} == {"old", "new"}
+
+
+def test_new_key_is_promoted_once_the_window_has_passed(tmp_path, clock):
+    add_key(tmp_path, "old", 10_000, clock.now)
+    add_key(tmp_path, "new", 10, clock.now)
+    ring = make_ring(tmp_path)
+
+    clock.now += PREPUBLISH - 20
+    assert ring.reload() is False
+    assert ring.signing_key().kid == "old"
+
+    # Same files on disk: promotion comes from the timer alone
+    clock.now += 20
+    assert ring.reload() is True
+    assert ring.signing_key().kid == "new"
+
+
+def test_oldest_key_signs_when_none_has_been_published_long_enough(tmp_path, clock):
+    add_key(tmp_path, "first", 60, clock.now)
+    add_key(tmp_path, "second", 30, clock.now)
+
+    ring = make_ring(tmp_path)
+
+    assert ring.signing_key().kid == "first"
+
+
+def test_signing_kid_pins_the_active_key(tmp_path, clock):
+    add_key(tmp_path, "old", 10_000, clock.now)
+    add_key(tmp_path, "new", 10, clock.now)
+
+    assert make_ring(tmp_path, signing_kid="new").signing_key().kid == "new"
+
+    clock.now += PREPUBLISH
+    pinned = make_ring(tmp_path, signing_kid="old")
+    assert pinned.signing_key().kid == "old"
+
+
+def test_corrupt_key_file_keeps_previous_keys(tmp_path, clock, capsys):
+    add_key(tmp_path, "old", 10_000, clock.now)
+    ring = make_ring(tmp_path)
+    version = ring.version
+
+    (tmp_path / "broken.private.pem").write_text("not a key")
+
+    with pytest.raises(ValueError, match="broken.private.pem"):
+        ring.reload()
+    assert ring.signing_key().kid == "old"
+    assert [key.kid for key in ring.keys()] == ["old"]
+    assert ring.version == version
+
+    # Background polling swallows the error but still reports it
+    ring.maybe_reload()
+    stats = ring.stats()
+    assert stats["reload_failures"] >= 2
+    assert "broken.private.pem" in stats["last_error"]
+    assert "Key reload failed" in capsys.readouterr().out
+
+    (tmp_path / "broken.private.pem").unlink()
+    ring.reload()
+    assert ring.stats()["last_error"] is None
+
+
+def test_listeners_fire_only_when_something_changed(tmp_path, clock):
+    add_key(tmp_path, "old", 10_000, clock.now)
+    ring = make_ring(tmp_path)
+    calls = []
+    ring.on_reload(lambda r: calls.append(r.signing_key().kid))
+
+    assert ring.reload() is False
+    ring.maybe_reload()
+    assert calls == []
+
+    add_key(tmp_path, "new", 10, clock.now)
+    assert ring.reload() is True
+    assert calls == ["old"]
+
+    clock.now += PREPUBLISH
+    ring.reload()
+    assert calls == ["old", "new"]
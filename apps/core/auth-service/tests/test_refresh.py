@@ -0,0 +1,94 @@
+"""Refresh token rotation and family revocation against a SQLite database."""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select, update
+
+from app.models.oauth import RefreshToken
+from app.oauth.refresh import hash_refresh_token, issue_refresh_token, rotate_refresh_token
+
+USER_ID = "7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d"
+CLIENT_ID = "forms-web"
+
+
+def family(engine, token: str):
+    """Every row in the family the token belongs to"""
+    with Session(engine) as session:
+        row = session.exec(select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))).one()
+        return session.exec(select(RefreshToken).where(RefreshToken.family_id == row.family_id)).all()
+
+
+def test_rotation_spends_the_token_and_issues_a_successor(sqlite_db):
+    async def scenario():
+        first = await issue_refresh_token(USER_ID, CLIENT_ID, "openid email")
+        successor, spent = await rotate_refresh_token(first, CLIENT_ID)
+        return first, successor, spent
+
+    first, successor, spent = asyncio.run(scenario())
+
+    assert successor != first
+    assert spent.user_id == USER_ID and spent.scope == "openid email"
+    rows = {row.token_hash: row for row in family(sqlite_db, first)}
+    assert rows[hash_refresh_token(first)].used is True
+    assert rows[hash_refresh_token(successor)].used is False
+    assert not any(row.revoked for row in rows.values())
+
+
+def test_replaying_a_spent_token_revokes_the_family(sqlite_db):
+    async def scenario():
+        first = await issue_refresh_token(USER_ID, CLIENT_ID, "openid")
+        successor, _ = await rotate_refresh_token(first, CLIENT_ID)
+
+        assert await rotate_refresh_token(first, CLIENT_ID) is None
+        # The legitimate holder's successor dies with the family
+        assert await rotate_refresh_token(successor, CLIENT_ID) is None
+        return first
+
+    first = asyncio.run(scenario())
+
+    rows = family(sqlite_db, first)
+    assert len(rows) == 2
+    assert all(row.revoked for row in rows)
+
+
+def test_concurrent_rotations_issue_one_successor(sqlite_db):
+    async def scenario():
+        first = await issue_refresh_token(USER_ID, CLIENT_ID, "openid")
+        results = await asyncio.gather(*[rotate_refresh_token(first, CLIENT_ID) for _ in range(5)])
+        return first, results
+
+    first, results = asyncio.run(scenario())
+
+    assert sum(bool(result) for result in results) == 1
+    # The losers look like replays, so the family is revoked
+    assert all(row.revoked for row in family(sqlite_db, first))
+
+
+def test_client_mismatch_revokes_the_family(sqlite_db):
+    async def scenario():
+        first = await issue_refresh_token(USER_ID, CLIENT_ID, "openid")
+        assert await rotate_refresh_token(first, "other-client") is None
+        assert await rotate_refresh_token(first, CLIENT_ID) is None
+        return first
+
+    first = asyncio.run(scenario())
+
+    rows = family(sqlite_db, first)
+    assert len(rows) == 1
+    assert rows[0].revoked is True
+
+
+def test_expired_token_is_rejected_without_revoking(sqlite_db):
+    first = asyncio.run(issue_refresh_token(USER_ID, CLIENT_ID, "openid"))
+    with Session(sqlite_db) as session:
+        session.exec(update(RefreshToken).values(expires_at=datetime.now() - timedelta(seconds=1)))
+        session.commit()
+
+    assert asyncio.run(rotate_refresh_token(first, CLIENT_ID)) is None
+
+    rows = family(sqlite_db, first)
+    assert rows[0].used is False and rows[0].revoked is False
+
+
+def test_unknown_token_is_rejected(sqlite_db):
+    assert asyncio.run(rotate_refresh_token("never-issued", CLIENT_ID)) is None
@@ -0,0 +1,125 @@
+"""StatelessCodeStore: sealed codes, tampering, expiry and the replay filter."""
+import asyncio
+import base64
+import os
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import app.oauth.codes.stateless_store as stateless_module
+from app.models.oauth import AuthorizationCode
+from app.oauth.codes.stateless_store import ReplayFilter, StatelessCodeStore
+
+LIFETIME = timedelta(minutes=5)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock seen by the store and its replay filter"""
+    clock = SimpleNamespace(now=time.time())
+    monkeypatch.setattr(stateless_module, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def make_code(lifetime: timedelta = LIFETIME) -> AuthorizationCode:
+    return AuthorizationCode(
+        code="",
+        user_id="7f1c7a3e-0d1e-4f51-9d1c-3a8e2b1f0c9d",
+        client_id="forms-web",
+        redirect_uri="https://forms.example.com/callback",
+        scope="openid email",
+        code_challenge="E9Melhoa2OwvFrEMTJguCHaoeK1t8URWbuGJSstw-cM",
+        code_challenge_method="S256",
+        expires_at=datetime.now() + lifetime,
+    )
+
+
+def flip_last_byte(code: str) -> str:
+    raw = bytearray(base64.urlsafe_b64decode(code + "=" * (-len(code) % 4)))
+    raw[-1] ^= 0x01
+    return base64.urlsafe_b64encode(bytes(raw)).decode().rstrip("=")
+
+
+def test_redeem_returns_the_sealed_grant(clock):
+    store = StatelessCodeStore(os.urandom(32))
+    saved = make_code()
+
+    async def scenario():
+        code = await store.save(saved)
+        return code, await store.redeem(code)
+
+    code, redeemed = asyncio.run(scenario())
+    assert redeemed.code == code
+    assert redeemed.user_id == saved.user_id
+    assert redeemed.client_id == saved.client_id
+    assert redeemed.redirect_uri == saved.redirect_uri
+    assert redeemed.code_challenge == saved.code_challenge
+    assert redeemed.expires_at == saved.expires_at
+
+
+def test_tampered_ciphertext_is_rejected(clock):
+    store = StatelessCodeStore(os.urandom(32))
+    code = asyncio.run(store.save(make_code()))
+
+    assert asyncio.run(store.redeem(flip_last_byte(code))) is None
+    assert asyncio.run(store.redeem("not-a-code!")) is None
+    # The untouched code is still good: rejects do not consume it
+    assert asyncio.run(store.redeem(code)) is not None
+
+
+def test_code_sealed_with_another_key_is_rejected(clock):
+    issuer = StatelessCodeStore(os.urandom(32))
+    other = StatelessCodeStore(os.urandom(32))
+    code = asyncio.run(issuer.save(make_code()))
+
+    assert asyncio.run(other.redeem(code)) is None
+    assert len(other.replay_filter) == 0
+
+
+def test_expired_code_is_rejected(clock):
+    store = StatelessCodeStore(os.urandom(32))
+    code = asyncio.run(store.save(make_code()))
+
+    clock.now += LIFETIME.total_seconds() + 1
+
+    assert asyncio.run(store.redeem(code)) is None
+
+
+def test_replayed_code_is_rejected(clock):
+    store = StatelessCodeStore(os.urandom(32))
+
+    async def scenario():
+        code = await store.save(make_code())
+        return await asyncio.gather(*[store.redeem(code) for _ in range(10)])
+
+    results = asyncio.run(scenario())
+    assert sum(result is not None for result in results) == 1
+    assert len(store.replay_filter) == 1
+
+
+def test_replay_filter_forgets_ids_once_their_codes_have_expired(clock):
+    replay_filter = ReplayFilter(bucket_seconds=30)
+    expires_at = clock.now + LIFETIME.total_seconds()
+
+    assert replay_filter.check_and_add(b"first", expires_at) is True
+    assert replay_filter.check_and_add(b"first", expires_at) is False
+
+    # Still remembered until the whole bucket holding the expiry has passed
+    clock.now = expires_at
+    assert replay_filter.check_and_add(b"first", expires_at) is False
+
+    clock.now = expires_at + 30
+    assert replay_filter.check_and_add(b"second", clock.now + LIFETIME.total_seconds()) is True
+    assert len(replay_filter) == 1
+
+
+def test_full_replay_filter_refuses_new_codes(clock):
+    replay_filter = ReplayFilter(bucket_seconds=30, max_entries=2)
+    expires_at = clock.now + LIFETIME.total_seconds()
+
+    assert replay_filter.check_and_add(b"a", expires_at) is True
+    assert replay_filter.check_and_add(b"b", expires_at) is True
+    assert replay_filter.check_and_add(b"c", expires_at) is False
+    assert len(replay_filter) == 2
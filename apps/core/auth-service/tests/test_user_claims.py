@@ -0,0 +1,100 @@
+"""UserClaimsService against SQLite: single-flight loads and commit invalidation."""
+import asyncio
+
+import pytest
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.oidc.user_claims as user_claims_module
+from app.database import get_async_engine
+from app.models.user import User
+from app.oidc.user_claims import UserClaimsService, load_profile
+
+
+@pytest.fixture
+def service(sqlite_db, monkeypatch):
+    """A fresh service wired to the after_commit hook, counting DB loads"""
+    queries = []
+
+    async def counting_loader(sub):
+        queries.append(sub)
+        # Yield so concurrent callers overlap the load
+        await asyncio.sleep(0.01)
+        return await load_profile(sub)
+
+    service = UserClaimsService(max_size=100, ttl=300, loader=counting_loader)
+    service.queries = queries
+    monkeypatch.setattr(user_claims_module, "user_claims", service)
+    return service
+
+
+@pytest.fixture
+def user(sqlite_db):
+    with Session(sqlite_db, expire_on_commit=False) as session:
+        user = User(email="ada@example.com", password_hash="unused")
+        session.add(user)
+        session.commit()
+    return user
+
+
+def test_concurrent_lookups_for_one_user_query_once(service, user):
+    async def scenario():
+        return await asyncio.gather(*[service.get_claims(str(user.id), ["openid", "email"]) for _ in range(10)])
+
+    results = asyncio.run(scenario())
+
+    assert results == [{"sub": str(user.id), "email": "ada@example.com", "email_verified": False}] * 10
+    assert service.queries == [str(user.id)]
+    stats = service.stats()
+    assert stats["loads"] == 1
+    assert stats["coalesced"] == 9
+    assert stats["in_flight"] == 0
+
+
+def test_committed_update_invalidates_the_cached_profile(service, user):
+    sub = str(user.id)
+
+    async def scenario():
+        assert (await service.get_claims(sub, ["email"]))["email_verified"] is False
+        assert (await service.get_claims(sub, ["email"]))["email_verified"] is False
+        assert service.stats()["loads"] == 1
+
+        async with AsyncSession(get_async_engine()) as session:
+            row = await session.get(User, user.id)
+            row.email_verified = True
+            session.add(row)
+            await session.commit()
+
+        assert service.stats()["invalidations"] == 1
+        return await service.get_claims(sub, ["email"])
+
+    assert asyncio.run(scenario())["email_verified"] is True
+    assert service.stats()["loads"] == 2
+
+
+def test_rolled_back_update_keeps_the_cached_profile(service, user, sqlite_db):
+    sub = str(user.id)
+    asyncio.run(service.get_profile(sub))
+
+    with Session(sqlite_db) as session:
+        row = session.get(User, user.id)
+        row.email_verified = True
+        session.add(row)
+        session.flush()
+        session.rollback()
+
+    assert service.stats()["invalidations"] == 0
+    assert asyncio.run(service.get_profile(sub))["email_verified"] is False
+    assert service.stats()["loads"] == 1
+
+
+def test_deleted_user_is_invalidated(service, user, sqlite_db):
+    sub = str(user.id)
+    assert asyncio.run(service.get_profile(sub)) is not None
+
+    with Session(sqlite_db) as session:
+        session.delete(session.get(User, user.id))
+        session.commit()
+
+    assert asyncio.run(service.get_profile(sub)) is None
+    assert service.stats()["loads"] == 2
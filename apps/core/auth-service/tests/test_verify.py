@@ -0,0 +1,112 @@
+"""LocalKeyResolver: single-flight refresh, unknown kid cache and key removal."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import jwt
+import pytest
+
+import app.oidc.verify as verify_module
+from app.oauth.encoder import JWTEncoder
+from app.oauth.keyring import Key, KeyRing, generate_key
+from app.oidc.verify import LocalKeyResolver
+
+
+class FakeRing:
+    """Stands in for KeyRing; reload() is slow so concurrent callers overlap"""
+
+    def __init__(self, kids, reload_adds=()):
+        self._keys = [Key(kid=kid, public_key=None) for kid in kids]
+        self.reload_adds = list(reload_adds)
+        self.reloads = 0
+
+    def reload(self) -> bool:
+        self.reloads += 1
+        time.sleep(0.05)
+        self._keys += [Key(kid=kid, public_key=None) for kid in self.reload_adds]
+        return bool(self.reload_adds)
+
+    def keys(self):
+        return list(self._keys)
+
+
+class BrokenRing(FakeRing):
+    def reload(self) -> bool:
+        self.reloads += 1
+        raise ValueError("Cannot load broken.private.pem")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(verify_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_concurrent_misses_on_one_kid_refresh_once():
+    ring = FakeRing(["old"], reload_adds=["new"])
+    resolver = LocalKeyResolver(ring, ttl=300, negative_ttl=60)
+    resolver.get("old")
+    start = threading.Barrier(8)
+
+    def lookup(_):
+        start.wait()
+        return resolver.get("new").kid
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        kids = list(pool.map(lookup, range(8)))
+
+    assert kids == ["new"] * 8
+    assert ring.reloads == 1
+
+
+def test_unknown_kid_is_rejected_without_refresh_until_ttl(clock):
+    ring = FakeRing(["old"])
+    resolver = LocalKeyResolver(ring, ttl=300, negative_ttl=60)
+
+    with pytest.raises(jwt.InvalidTokenError):
+        resolver.get("ghost")
+    assert ring.reloads == 1
+
+    clock.now += 59
+    with pytest.raises(jwt.InvalidTokenError):
+        resolver.get("ghost")
+    assert ring.reloads == 1
+
+    clock.now += 1
+    with pytest.raises(jwt.InvalidTokenError):
+        resolver.get("ghost")
+    assert ring.reloads == 2
+
+
+def test_reload_failure_leaves_kid_unknown(clock):
+    ring = BrokenRing(["old"])
+    resolver = LocalKeyResolver(ring, ttl=300, negative_ttl=60)
+
+    with pytest.raises(jwt.InvalidTokenError):
+        resolver.get("ghost")
+    assert ring.reloads == 1
+    assert resolver.get("old").kid == "old"
+
+
+def test_removed_key_stops_verifying_right_after_reload(tmp_path):
+    generate_key(str(tmp_path), "keep", "EdDSA")
+    removed_path = generate_key(str(tmp_path), "removed", "EdDSA")
+    ring = KeyRing(str(tmp_path), check_interval=300, prepublish_seconds=0)
+    ring.load()
+    # ttl far beyond the test, so only the reload listener can drop the key
+    resolver = LocalKeyResolver(ring, ttl=3600, negative_ttl=60)
+    ring.on_reload(resolver.on_key_change)
+
+    removed_key = ring.get("removed")
+    token = JWTEncoder().encode(removed_key, {"iss": "test", "sub": "user-1"})
+    signing_key = resolver.get(jwt.get_unverified_header(token)["kid"])
+    assert jwt.decode(token, signing_key.public_key, algorithms=[signing_key.alg])["sub"] == "user-1"
+
+    removed_path.unlink()
+    assert ring.reload() is True
+
+    with pytest.raises(jwt.InvalidTokenError):
+        resolver.get("removed")
+    assert resolver.get("keep").kid == "keep"